@@ -226,6 +226,13 @@ def build_from_external_data(
     
     logger.info(f"[INFO] Fetching data for {len(ticker_list)} companies...")
     
+    # Fetch provider data concurrently up front; the per-ticker updates
+    # below are then served from the provider's cache
+    if db.data_provider:
+        db.data_provider.get_company_info_batch(
+            [t.strip() for t in ticker_list if isinstance(t, str) and t.strip()]
+        )
+    
     processed = 0
     errors = 0
     
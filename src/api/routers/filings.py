@@ -7,12 +7,13 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 
 from ..models.filing import FilingChunk, CompanyFiling, FilingSearchResponse
+from ..services.risk_service import get_shared_client
 from ...db.snowflake_client import SnowflakeClient
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-snowflake_client = SnowflakeClient()
+snowflake_client = get_shared_client('snowflake', SnowflakeClient)
 
 
 @router.get("/companies", response_model=List[str])
@@ -27,11 +28,9 @@ async def list_companies():
 async def get_company_filings(ticker: str):
     """Get all filings for a company."""
     try:
-        chunks = snowflake_client.get_company_chunks(ticker)
-        
-        # Group by filing
+        # Group by filing while streaming; only counts are needed here
         filings = {}
-        for chunk in chunks:
+        for chunk in snowflake_client.get_company_chunks_iter(ticker):
             filing_key = f"{chunk.get('filing_type')}_{chunk.get('filing_date')}"
             if filing_key not in filings:
                 filings[filing_key] = {
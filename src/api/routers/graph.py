@@ -6,12 +6,13 @@ import logging
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
 
+from ..services.risk_service import get_shared_client
 from ...db.neo4j_client import Neo4jClient
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-neo4j_client = Neo4jClient()
+neo4j_client = get_shared_client('neo4j', Neo4jClient)
 
 
 @router.get("/{ticker}")
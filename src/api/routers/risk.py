@@ -10,16 +10,14 @@ from ..models.risk import RiskAnalysisRequest, RiskAnalysisResponse, RiskScore,
 from ..models.recommendation import RecommendationResponse, Recommendation, TraceableParagraph
 from ..services.risk_service import RiskService
 from ..services.polymarket_service import PolymarketService
-from ...db.neo4j_client import Neo4jClient
-from ...llm.gemini_client import GeminiClient
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 risk_service = RiskService()
 polymarket_service = PolymarketService()
-neo4j_client = Neo4jClient()
-gemini_client = GeminiClient()
+neo4j_client = risk_service.neo4j_client
+gemini_client = risk_service.gemini_client
 
 
 @router.post("/analyze", response_model=RiskAnalysisResponse)
@@ -2,7 +2,7 @@
 API services.
 """
 
-from .risk_service import RiskService
+from .risk_service import RiskService, get_shared_client
 from .polymarket_service import PolymarketService
 
-__all__ = ['RiskService', 'PolymarketService']
+__all__ = ['RiskService', 'PolymarketService', 'get_shared_client']
@@ -5,7 +5,8 @@ Wraps RegulatoryRiskScorer and integrates with Snowflake and Polymarket.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, Callable, List, Optional
 import numpy as np
 
 from src.vectordb.risk_scorer import RegulatoryRiskScorer
@@ -15,6 +16,41 @@ from src.llm.gemini_client import GeminiClient
 
 logger = logging.getLogger(__name__)
 
+# Fields of each top contributor in the API response. The scorer's entries
+# also carry its weight components (w_section, w_recency, w_size), which are
+# not part of the response.
+TOP_CONTRIBUTOR_KEYS = (
+    'section_type', 'section_title', 'filing_type', 'filing_date',
+    'sentence_text', 'similarity', 'weight', 'exposure'
+)
+
+# Process-wide external clients, keyed by name. Each client opens its own
+# connection on construction, so they are created once and shared by every
+# RiskService and router instead of being rebuilt per service.
+_shared_clients: Dict[str, Any] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def get_shared_client(name: str, factory: Callable[[], Any]) -> Any:
+    """
+    Get the shared client registered under name, creating it on first use.
+    
+    Args:
+        name: Client key (e.g. 'snowflake', 'neo4j', 'gemini')
+        factory: Zero-argument callable that builds the client
+    
+    Returns:
+        Shared client instance
+    """
+    client = _shared_clients.get(name)
+    if client is None:
+        with _shared_clients_lock:
+            client = _shared_clients.get(name)
+            if client is None:
+                client = factory()
+                _shared_clients[name] = client
+    return client
+
 
 class RiskService:
     """
@@ -36,13 +72,13 @@ class RiskService:
         Initialize risk service.
         
         Args:
-            snowflake_client: SnowflakeClient instance
-            neo4j_client: Neo4jClient instance
-            gemini_client: GeminiClient instance
+            snowflake_client: SnowflakeClient instance (shared client if None)
+            neo4j_client: Neo4jClient instance (shared client if None)
+            gemini_client: GeminiClient instance (shared client if None)
         """
-        self.snowflake_client = snowflake_client or SnowflakeClient()
-        self.neo4j_client = neo4j_client or Neo4jClient()
-        self.gemini_client = gemini_client or GeminiClient()
+        self.snowflake_client = snowflake_client or get_shared_client('snowflake', SnowflakeClient)
+        self.neo4j_client = neo4j_client or get_shared_client('neo4j', Neo4jClient)
+        self.gemini_client = gemini_client or get_shared_client('gemini', GeminiClient)
         self.risk_scorer = RegulatoryRiskScorer()
         
         logger.info("[OK] RiskService initialized")
@@ -128,19 +164,12 @@ class RiskService:
             polymarket_p=polymarket_probability
         )
         
-        # Step 7: Format top contributors
-        top_contributors = []
-        for contrib in risk_result.get('top_contributors', [])[:10]:
-            top_contributors.append({
-                'section_type': contrib.get('section_type', 'unknown'),
-                'section_title': contrib.get('section_title', ''),
-                'filing_type': contrib.get('filing_type', 'N/A'),
-                'filing_date': contrib.get('filing_date', 'N/A'),
-                'sentence_text': contrib.get('sentence_text', ''),
-                'similarity': contrib.get('similarity', 0.0),
-                'weight': contrib.get('weight', 0.0),
-                'exposure': contrib.get('exposure', 0.0)
-            })
+        # Step 7: Top contributors, projected to the API key set (the scorer
+        # already applies the defaults)
+        top_contributors = [
+            {key: contrib[key] for key in TOP_CONTRIBUTOR_KEYS}
+            for contrib in risk_result.get('top_contributors', [])[:10]
+        ]
         
         return {
             'success': True,
@@ -4,5 +4,6 @@ Database clients for Snowflake and Neo4j.
 
 from .snowflake_client import SnowflakeClient
 from .neo4j_client import Neo4jClient
+from .resilience import CircuitOpenError
 
-__all__ = ['SnowflakeClient', 'Neo4jClient']
+__all__ = ['SnowflakeClient', 'Neo4jClient', 'CircuitOpenError']
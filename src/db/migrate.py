@@ -0,0 +1,38 @@
+"""
+Deploy-time schema setup for the database clients.
+
+Creates the Snowflake database, schema and filings table if they are
+missing. Run once per deployment so application processes can connect
+without issuing DDL on every start.
+
+Usage:
+    python -m src.db.migrate
+"""
+
+import logging
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.db.snowflake_client import SnowflakeClient
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """CLI entry point for schema migration."""
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(levelname)s] %(message)s'
+    )
+    
+    client = SnowflakeClient(ensure_schema=True)
+    client.close()
+    logger.info("[OK] Snowflake schema is up to date")
+
+
+if __name__ == "__main__":
+    main()
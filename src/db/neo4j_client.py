@@ -7,11 +7,41 @@ with relationships for supply chains and regulatory impact.
 
 import logging
 import os
-from typing import Dict, Any, List, Optional
-from neo4j import GraphDatabase, ManagedTransaction
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+from neo4j import GraphDatabase, ManagedTransaction, Session
+from neo4j.exceptions import ClientError, ServiceUnavailable, SessionExpired, TransientError
+
+from .resilience import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
+# Schema tokens that may be interpolated into Cypher (labels and types cannot
+# be parameters). Everything else is passed as a $parameter so the query text,
+# and therefore the cached plan, is stable across calls.
+ALLOWED_LABELS = frozenset({'Company', 'Sector', 'Supplier', 'Country', 'Law', 'PolymarketBet'})
+# Relationship types come from LLM extraction, so they are checked for shape
+# rather than against a fixed list.
+RELATIONSHIP_TYPE_PATTERN = re.compile(r'^[A-Z][A-Z0-9_]{0,63}$')
+MAX_CONTEXT_DEPTH = 5
+# Rows per server-side transaction in apoc.periodic.iterate
+APOC_BATCH_SIZE = 1000
+
+# Errors that mean the server is unavailable or overloaded; only these count
+# toward the circuit breaker. ClientError (bad Cypher, constraint violations,
+# missing procedures) does not.
+TRANSIENT_ERRORS = (ServiceUnavailable, SessionExpired, TransientError)
+
+# (label, property) pairs that MERGE statements match on
+UNIQUE_CONSTRAINTS = [
+    ('Company', 'ticker'),
+    ('Sector', 'name'),
+    ('Supplier', 'name'),
+    ('Law', 'id'),
+]
+
 
 class Neo4jClient:
     """
@@ -24,7 +54,8 @@ class Neo4jClient:
         self,
         uri: Optional[str] = None,
         user: Optional[str] = None,
-        password: Optional[str] = None
+        password: Optional[str] = None,
+        database: Optional[str] = None
     ):
         """
         Initialize Neo4j client.
@@ -33,23 +64,126 @@ class Neo4jClient:
             uri: Neo4j Aura URI (e.g., neo4j+s://xxxx.databases.neo4j.io)
             user: Neo4j username
             password: Neo4j password
+            database: Database name (default: neo4j). Passing it explicitly
+                skips the home-database lookup on every session.
         """
         self.uri = uri or os.getenv('NEO4J_URI')
         self.user = user or os.getenv('NEO4J_USER')
         self.password = password or os.getenv('NEO4J_PASSWORD')
+        self.database = database or os.getenv('NEO4J_DATABASE', 'neo4j')
+        # Bulk sessions are per thread so concurrent callers never share one
+        self._local = threading.local()
+        self._breaker = CircuitBreaker('Neo4j', failure_types=TRANSIENT_ERRORS)
+        # Unknown until the first bulk upsert probes for APOC
+        self._apoc_available: Optional[bool] = None
         
         if not all([self.uri, self.user, self.password]):
             raise ValueError("Neo4j credentials must be provided via env vars or constructor")
         
-        self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
+        self.driver = GraphDatabase.driver(
+            self.uri,
+            auth=(self.user, self.password),
+            max_connection_pool_size=50,
+            connection_acquisition_timeout=60,
+            max_connection_lifetime=3600
+        )
         
         # Verify connection
         try:
             self.driver.verify_connectivity()
-            logger.info(f"[OK] Neo4jClient connected to {self.uri}")
+            logger.info("[OK] Neo4jClient connected to %s", self.uri)
         except Exception as e:
-            logger.error(f"[ERROR] Failed to connect to Neo4j: {e}")
+            logger.error("[ERROR] Failed to connect to Neo4j: %s", e)
             raise
+        
+        self._ensure_constraints()
+    
+    def _ensure_constraints(self):
+        """
+        Create uniqueness constraints for the MERGE keys if missing.
+        
+        The backing indexes let MERGE look nodes up by key instead of
+        scanning the label, and prevent duplicate nodes under concurrent writes.
+        """
+        try:
+            agent = self.driver.get_server_info().agent  # e.g. "Neo4j/5.14.0"
+            major = int(agent.split('/')[-1].split('.')[0])
+        except Exception:
+            major = 5
+        
+        try:
+            with self._session() as session:
+                for label, prop in UNIQUE_CONSTRAINTS:
+                    if major >= 5:
+                        query = (
+                            f"CREATE CONSTRAINT IF NOT EXISTS "
+                            f"FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"
+                        )
+                    else:
+                        query = (
+                            f"CREATE CONSTRAINT IF NOT EXISTS "
+                            f"ON (n:{label}) ASSERT n.{prop} IS UNIQUE"
+                        )
+                    session.run(query).consume()
+            logger.info("[OK] Neo4j uniqueness constraints ensured")
+        except Exception as e:
+            logger.warning("[WARN] Failed to ensure Neo4j constraints: %s", e)
+    
+    @contextmanager
+    def bulk(self) -> Iterator["Neo4jClient"]:
+        """
+        Reuse one session for every call made inside the block.
+        
+        Ingest code that creates a company, its sectors, suppliers and
+        relationships back-to-back pays session acquisition once instead of
+        per call. The session belongs to the calling thread; other threads
+        using the same client keep opening their own sessions.
+        
+        Example:
+            with client.bulk():
+                client.create_company_node(...)
+                client.create_relationships(...)
+        """
+        if getattr(self._local, 'session', None) is not None:
+            yield self
+            return
+        
+        with self.driver.session(database=self.database) as session:
+            self._local.session = session
+            try:
+                yield self
+            finally:
+                self._local.session = None
+    
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        """Yield the active bulk session, or a fresh session if none."""
+        session = getattr(self._local, 'session', None)
+        if session is not None:
+            yield session
+        else:
+            with self.driver.session(database=self.database) as session:
+                yield session
+    
+    def _execute_write(self, tx_func: Callable[..., Any], *args) -> Any:
+        """
+        Run a write transaction function through the circuit breaker.
+        
+        The driver already retries transient errors inside execute_write;
+        the breaker stops a bulk load from paying that retry budget on every
+        call once the server is consistently unavailable.
+        """
+        def run():
+            with self._session() as session:
+                return session.execute_write(tx_func, *args)
+        return self._breaker.call(run)
+    
+    def _execute_read(self, tx_func: Callable[..., Any], *args) -> Any:
+        """Run a read transaction function through the circuit breaker."""
+        def run():
+            with self._session() as session:
+                return session.execute_read(tx_func, *args)
+        return self._breaker.call(run)
     
     def close(self):
         """Close Neo4j driver connection."""
@@ -78,9 +212,9 @@ class Neo4jClient:
         Returns:
             True if successful
         """
-        logger.info(f"[INFO] Creating/updating Company node: {ticker}")
+        logger.info("[INFO] Creating/updating Company node: %s", ticker)
         
-        def _create_company(tx: ManagedTransaction, ticker: str, company_name: str, sector: Optional[str] = None, industry: Optional[str] = None, cik: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        def _create_company(tx: ManagedTransaction, ticker: str, company_name: str, sector: Optional[str] = None, industry: Optional[str] = None, cik: Optional[str] = None) -> None:
             query = """
             MERGE (c:Company {ticker: $ticker})
             SET c.company_name = $company_name,
@@ -88,7 +222,6 @@ class Neo4jClient:
                 c.industry = $industry,
                 c.cik = $cik,
                 c.updated_at = datetime()
-            RETURN c
             """
             result = tx.run(
                 query,
@@ -98,18 +231,17 @@ class Neo4jClient:
                 industry=industry,
                 cik=cik
             )
-            return result.single()
+            result.consume()
         
         try:
-            with self.driver.session() as session:
-                result = session.execute_write(
-                    _create_company,
-                    ticker, company_name, sector, industry, cik
-                )
-                logger.info(f"[OK] Company node created/updated: {ticker}")
-                return True
+            self._execute_write(
+                _create_company,
+                ticker, company_name, sector, industry, cik
+            )
+            logger.info("[OK] Company node created/updated: %s", ticker)
+            return True
         except Exception as e:
-            logger.error(f"[ERROR] Failed to create company node: {e}")
+            logger.error("[ERROR] Failed to create company node: %s", e)
             return False
     
     def create_sector_node(self, sector_name: str) -> bool:
@@ -118,18 +250,15 @@ class Neo4jClient:
             query = """
             MERGE (s:Sector {name: $sector_name})
             SET s.updated_at = datetime()
-            RETURN s
             """
-            result = tx.run(query, sector_name=sector_name)
-            return result.single()
+            tx.run(query, sector_name=sector_name).consume()
         
         try:
-            with self.driver.session() as session:
-                session.execute_write(_create_sector, sector_name)
-                logger.info(f"[OK] Sector node created: {sector_name}")
-                return True
+            self._execute_write(_create_sector, sector_name)
+            logger.info("[OK] Sector node created: %s", sector_name)
+            return True
         except Exception as e:
-            logger.error(f"[ERROR] Failed to create sector node: {e}")
+            logger.error("[ERROR] Failed to create sector node: %s", e)
             return False
     
     def create_supplier_node(self, supplier_name: str, supplier_type: Optional[str] = None) -> bool:
@@ -139,20 +268,109 @@ class Neo4jClient:
             MERGE (s:Supplier {name: $supplier_name})
             SET s.supplier_type = $supplier_type,
                 s.updated_at = datetime()
-            RETURN s
             """
-            result = tx.run(query, supplier_name=supplier_name, supplier_type=supplier_type)
-            return result.single()
+            tx.run(query, supplier_name=supplier_name, supplier_type=supplier_type).consume()
         
         try:
-            with self.driver.session() as session:
-                session.execute_write(_create_supplier, supplier_name, supplier_type)
-                logger.info(f"[OK] Supplier node created: {supplier_name}")
-                return True
+            self._execute_write(_create_supplier, supplier_name, supplier_type)
+            logger.info("[OK] Supplier node created: %s", supplier_name)
+            return True
         except Exception as e:
-            logger.error(f"[ERROR] Failed to create supplier node: {e}")
+            logger.error("[ERROR] Failed to create supplier node: %s", e)
             return False
     
+    def bulk_upsert_suppliers(
+        self,
+        ticker: str,
+        suppliers: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Upsert Supplier nodes and their SUPPLIES_TO edges in one call.
+        
+        Uses apoc.periodic.iterate so the server batches and commits the
+        MERGEs itself (APOC must be enabled on the instance; Aura ships it).
+        Falls back to a single UNWIND transaction when APOC is unavailable.
+        
+        Args:
+            ticker: Company ticker
+            suppliers: List of supplier dicts with:
+                - name: supplier name
+                - supplier_type: optional supplier type
+                - properties: optional relationship properties
+        
+        Returns:
+            Number of suppliers upserted
+        """
+        rows = [
+            {
+                'name': s['name'],
+                'supplier_type': s.get('supplier_type'),
+                'props': s.get('properties') or {}
+            }
+            for s in suppliers if s.get('name')
+        ]
+        if not rows:
+            return 0
+        
+        logger.info("[INFO] Upserting %s suppliers for %s", len(rows), ticker)
+        
+        merge_query = """
+            MATCH (c:Company {ticker: $ticker})
+            MERGE (s:Supplier {name: row.name})
+            SET s.supplier_type = coalesce(row.supplier_type, s.supplier_type),
+                s.updated_at = datetime()
+            MERGE (c)-[r:SUPPLIES_TO]->(s)
+            SET r += row.props
+            """
+        
+        def _unwind_upsert(tx, ticker, rows):
+            query = f"UNWIND $rows AS row {merge_query} RETURN count(DISTINCT s) AS upserted"
+            return tx.run(query, ticker=ticker, rows=rows).single()['upserted']
+        
+        def _apoc_upsert():
+            # periodic.iterate commits its own batches, so it runs as an
+            # auto-commit query rather than inside a managed transaction
+            query = """
+            CALL apoc.periodic.iterate(
+                'UNWIND $rows AS row RETURN row',
+                $merge_query,
+                {batchSize: $batch_size, parallel: false, params: {rows: $rows, ticker: $ticker}}
+            )
+            YIELD total, failedOperations, errorMessages
+            RETURN total, failedOperations, errorMessages
+            """
+            with self._session() as session:
+                record = session.run(
+                    query,
+                    rows=rows,
+                    ticker=ticker,
+                    merge_query=merge_query,
+                    batch_size=APOC_BATCH_SIZE
+                ).single()
+            if record['failedOperations']:
+                raise RuntimeError(f"APOC upsert failed: {record['errorMessages']}")
+            return record['total']
+        
+        try:
+            if self._apoc_available is not False:
+                try:
+                    upserted = self._breaker.call(_apoc_upsert)
+                    self._apoc_available = True
+                    logger.info("[OK] Upserted %s suppliers for %s via APOC", upserted, ticker)
+                    return upserted
+                except ClientError as e:
+                    if e.code != 'Neo.ClientError.Procedure.ProcedureNotFound':
+                        raise
+                    logger.warning("[WARN] APOC not available, falling back to UNWIND upsert")
+                    self._apoc_available = False
+            
+            upserted = self._execute_write(_unwind_upsert, ticker, rows)
+            logger.info("[OK] Upserted %s suppliers for %s", upserted, ticker)
+            return upserted
+        except Exception as e:
+            logger.error("[ERROR] Failed to upsert suppliers: %s", e)
+            return 0
+    
     def create_relationships(
         self,
         ticker: str,
@@ -172,58 +390,60 @@ class Neo4jClient:
         Returns:
             Number of relationships created
         """
-        logger.info(f"[INFO] Creating {len(relationships)} relationships for {ticker}")
+        logger.info("[INFO] Creating %s relationships for %s", len(relationships), ticker)
         
-        def _create_relationships(tx, ticker, relationships):
+        # Group by (label, type) so each group is a single UNWIND query whose
+        # text stays stable across calls; values travel as parameters.
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for rel in relationships:
+            rel_type = rel.get('type', '').upper()
+            target = rel.get('target', '')
+            target_label = rel.get('target_label', '')
+            
+            if not all([rel_type, target, target_label]):
+                logger.warning("[WARN] Skipping invalid relationship: %s", rel)
+                continue
+            
+            if target_label not in ALLOWED_LABELS or not RELATIONSHIP_TYPE_PATTERN.match(rel_type):
+                logger.warning("[WARN] Skipping relationship with disallowed label/type: %s/%s", target_label, rel_type)
+                continue
+            
+            groups.setdefault((target_label, rel_type), []).append({
+                'target': target,
+                'props': rel.get('properties') or {}
+            })
+        
+        def _create_relationships(tx, ticker, groups):
             created_count = 0
             
-            for rel in relationships:
-                rel_type = rel.get('type', '').upper()
-                target = rel.get('target', '')
-                target_label = rel.get('target_label', '')
-                properties = rel.get('properties', {})
-                
-                if not all([rel_type, target, target_label]):
-                    logger.warning(f"[WARN] Skipping invalid relationship: {rel}")
-                    continue
-                
-                # Build properties string
-                props_str = ', '.join([f"r.{k} = ${k}" for k in properties.keys()])
-                props_dict = {k: v for k, v in properties.items()}
-                
+            for (target_label, rel_type), rows in groups.items():
                 query = f"""
+                UNWIND $rows AS row
                 MATCH (c:Company {{ticker: $ticker}})
-                MATCH (t:{target_label} {{name: $target}})
+                MATCH (t:{target_label} {{name: row.target}})
                 MERGE (c)-[r:{rel_type}]->(t)
-                {f'SET {props_str}' if props_str else ''}
-                RETURN r
+                SET r += row.props
+                RETURN count(r) AS created
                 """
                 
                 try:
-                    result = tx.run(
-                        query,
-                        ticker=ticker,
-                        target=target,
-                        **props_dict
-                    )
-                    if result.single():
-                        created_count += 1
+                    result = tx.run(query, ticker=ticker, rows=rows)
+                    created_count += result.single()['created']
                 except Exception as e:
-                    logger.warning(f"[WARN] Failed to create relationship {rel_type}: {e}")
+                    logger.warning("[WARN] Failed to create %s relationships: %s", rel_type, e)
                     continue
             
             return created_count
         
         try:
-            with self.driver.session() as session:
-                created_count = session.execute_write(
-                    _create_relationships,
-                    ticker, relationships
-                )
-                logger.info(f"[OK] Created {created_count} relationships for {ticker}")
-                return created_count
+            created_count = self._execute_write(
+                _create_relationships,
+                ticker, groups
+            )
+            logger.info("[OK] Created %s relationships for %s", created_count, ticker)
+            return created_count
         except Exception as e:
-            logger.error(f"[ERROR] Failed to create relationships: {e}")
+            logger.error("[ERROR] Failed to create relationships: %s", e)
             return 0
     
     def get_company_context(
@@ -236,19 +456,28 @@ class Neo4jClient:
         
         Args:
             ticker: Company ticker
-            depth: Traversal depth
+            depth: Traversal depth (clamped to 1..MAX_CONTEXT_DEPTH)
         
         Returns:
             Dictionary with company info and related entities
         """
-        logger.info(f"[INFO] Getting context for {ticker} (depth={depth})")
+        depth = max(1, min(int(depth), MAX_CONTEXT_DEPTH))
+        logger.info("[INFO] Getting context for %s (depth=%s)", ticker, depth)
         
         def _get_context(tx, ticker, depth):
+            # Relationships are flattened and deduplicated server-side, so the
+            # result grows with unique edges rather than with paths x edges.
+            # Variable-length bounds cannot be parameters; depth is a clamped int.
             query = f"""
             MATCH (c:Company {{ticker: $ticker}})
-            OPTIONAL MATCH path = (c)-[*1..{depth}]-(related)
-            RETURN c, collect(DISTINCT related) as related_nodes,
-                   collect(DISTINCT relationships(path)) as relationships
+            OPTIONAL MATCH (c)-[rels*1..{depth}]-(related)
+            UNWIND (CASE WHEN rels IS NULL THEN [null] ELSE rels END) AS rel
+            RETURN c, collect(DISTINCT related) AS related_nodes,
+                   collect(DISTINCT CASE WHEN rel IS NULL THEN null ELSE {{
+                       type: type(rel),
+                       start: coalesce(startNode(rel).ticker, startNode(rel).name),
+                       end: coalesce(endNode(rel).ticker, endNode(rel).name)
+                   }} END) AS relationships
             """
             result = tx.run(query, ticker=ticker)
             record = result.single()
@@ -258,16 +487,7 @@ class Neo4jClient:
             
             company = dict(record['c'])
             related_nodes = [dict(node) for node in record['related_nodes']]
-            relationships = []
-            
-            for rel_list in record['relationships']:
-                for rel in rel_list:
-                    if rel:
-                        relationships.append({
-                            'type': rel.type,
-                            'start': rel.start_node.get('ticker') or rel.start_node.get('name'),
-                            'end': rel.end_node.get('ticker') or rel.end_node.get('name')
-                        })
+            relationships = list(record['relationships'])
             
             return {
                 'company': company,
@@ -276,13 +496,12 @@ class Neo4jClient:
             }
         
         try:
-            with self.driver.session() as session:
-                context = session.execute_read(_get_context, ticker, depth)
-                if context:
-                    logger.info(f"[OK] Retrieved context for {ticker}")
-                return context or {}
+            context = self._execute_read(_get_context, ticker, depth)
+            if context:
+                logger.info("[OK] Retrieved context for %s", ticker)
+            return context or {}
         except Exception as e:
-            logger.error(f"[ERROR] Failed to get context: {e}")
+            logger.error("[ERROR] Failed to get context: %s", e)
             return {}
     
     def link_law_to_sectors(
@@ -302,7 +521,7 @@ class Neo4jClient:
         Returns:
             Number of relationships created
         """
-        logger.info(f"[INFO] Linking law {law_id} to {len(affected_sectors)} sectors")
+        logger.info("[INFO] Linking law %s to %s sectors", law_id, len(affected_sectors))
         
         def _link_law(tx, law_id, law_title, affected_sectors):
             # Create Law node
@@ -310,35 +529,31 @@ class Neo4jClient:
             MERGE (l:Law {id: $law_id})
             SET l.title = $law_title,
                 l.updated_at = datetime()
-            RETURN l
             """
-            tx.run(create_law_query, law_id=law_id, law_title=law_title)
+            tx.run(create_law_query, law_id=law_id, law_title=law_title).consume()
             
-            # Link to sectors
-            linked_count = 0
-            for sector in affected_sectors:
-                link_query = """
-                MATCH (l:Law {id: $law_id})
-                MATCH (s:Sector {name: $sector})
-                MERGE (l)-[r:AFFECTS]->(s)
-                RETURN r
-                """
-                result = tx.run(link_query, law_id=law_id, sector=sector)
-                if result.single():
-                    linked_count += 1
+            # Link to all sectors in one statement
+            link_query = """
+            UNWIND $sectors AS sector
+            MATCH (l:Law {id: $law_id})
+            MATCH (s:Sector {name: sector})
+            MERGE (l)-[r:AFFECTS]->(s)
+            RETURN count(r) AS linked
+            """
+            result = tx.run(link_query, law_id=law_id, sectors=affected_sectors)
+            linked_count = result.single()['linked']
             
             return linked_count
         
         try:
-            with self.driver.session() as session:
-                linked_count = session.execute_write(
-                    _link_law,
-                    law_id, law_title, affected_sectors
-                )
-                logger.info(f"[OK] Linked law to {linked_count} sectors")
-                return linked_count
+            linked_count = self._execute_write(
+                _link_law,
+                law_id, law_title, affected_sectors
+            )
+            logger.info("[OK] Linked law to %s sectors", linked_count)
+            return linked_count
         except Exception as e:
-            logger.error(f"[ERROR] Failed to link law: {e}")
+            logger.error("[ERROR] Failed to link law: %s", e)
             return 0
     
     def get_companies_by_sector(self, sector: str) -> List[str]:
@@ -352,9 +567,8 @@ class Neo4jClient:
             return [record['ticker'] for record in result]
         
         try:
-            with self.driver.session() as session:
-                tickers = session.execute_read(_get_companies, sector)
-                return tickers
+            tickers = self._execute_read(_get_companies, sector)
+            return tickers
         except Exception as e:
-            logger.error(f"[ERROR] Failed to get companies by sector: {e}")
+            logger.error("[ERROR] Failed to get companies by sector: %s", e)
             return []
@@ -0,0 +1,163 @@
+"""
+Retry and circuit-breaker helpers for database clients.
+
+Bulk loaders call the Snowflake and Neo4j clients many times in a row. When
+the backend is unreachable, every call would otherwise wait out its own
+timeout. The circuit breaker fails fast after repeated failures, and the
+retry helper absorbs short network blips with exponential backoff.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Tuple, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Closed: calls pass through. After fail_max consecutive failures of one
+    of the failure_types the circuit opens and calls raise CircuitOpenError
+    immediately. Once reset_timeout seconds have passed, a single trial call
+    is let through (half-open) while other callers keep failing fast;
+    success closes the circuit, failure re-opens it.
+
+    Other exceptions (bad SQL, constraint violations, ...) show the backend
+    is reachable, so they are re-raised without counting as failures.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fail_max: int = 5,
+        reset_timeout: float = 60.0,
+        failure_types: Tuple[Type[BaseException], ...] = (Exception,)
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Name used in log messages
+            fail_max: Consecutive failures before the circuit opens
+            reset_timeout: Seconds to stay open before a trial call
+            failure_types: Exception types that count as failures
+                (normally the client's transient errors)
+        """
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failure_types = failure_types
+        self._failures = 0
+        self._opened_at = None
+        self._half_open_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected."""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            return self._half_open_in_flight or time.monotonic() - self._opened_at < self.reset_timeout
+
+    def call(self, func: Callable[[], T]) -> T:
+        """
+        Run func through the breaker.
+
+        Args:
+            func: Zero-argument callable
+
+        Returns:
+            Result of func
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        with self._lock:
+            trial = False
+            if self._opened_at is not None:
+                if self._half_open_in_flight or time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError(f"{self.name} circuit is open; skipping call")
+                # Half-open: this call is the only trial until it finishes
+                self._half_open_in_flight = True
+                trial = True
+
+        try:
+            result = func()
+        except self.failure_types:
+            with self._lock:
+                if trial:
+                    self._half_open_in_flight = False
+                    self._opened_at = time.monotonic()
+                    logger.warning("[WARN] %s circuit re-opened after failed trial call", self.name)
+                else:
+                    self._failures += 1
+                    if self._failures >= self.fail_max and self._opened_at is None:
+                        self._opened_at = time.monotonic()
+                        logger.warning(
+                            "[WARN] %s circuit opened after %d consecutive failures",
+                            self.name, self._failures
+                        )
+            raise
+        except Exception:
+            # Not a backend failure; a trial that got this far reached the
+            # backend, so it still closes the circuit
+            if trial:
+                self._close()
+            raise
+        except BaseException:
+            # Interrupted trial: let the next caller probe instead
+            if trial:
+                with self._lock:
+                    self._half_open_in_flight = False
+            raise
+
+        self._close()
+        return result
+
+    def _close(self) -> None:
+        """Reset to the closed state."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._half_open_in_flight = False
+
+
+def with_retry(
+    func: Callable[[], T],
+    retry_on: Tuple[Type[BaseException], ...],
+    attempts: int = 4,
+    base_delay: float = 0.2,
+    max_delay: float = 5.0
+) -> T:
+    """
+    Call func, retrying transient errors with exponential backoff.
+
+    Args:
+        func: Zero-argument callable
+        retry_on: Exception types considered transient
+        attempts: Total number of attempts
+        base_delay: Delay before the first retry in seconds (doubles each retry)
+        max_delay: Upper bound on a single delay
+
+    Returns:
+        Result of func
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return func()
+        except retry_on as e:
+            if attempt == attempts:
+                raise
+            delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+            logger.warning("[WARN] Transient error (attempt %s/%s), retrying in %.1fs: %s", attempt, attempts, delay, e)
+            time.sleep(delay)
@@ -5,16 +5,44 @@ Uses Snowflake Cortex EMBED_TEXT_768 function for generating embeddings
 and VECTOR similarity search for finding relevant filing chunks.
 """
 
+import hashlib
+import json
 import logging
 import os
-from typing import Dict, Any, List, Optional, Tuple
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple, TypeVar
+import numpy as np
+import pandas as pd
 import snowflake.connector
 from snowflake.connector import DictCursor
+from snowflake.connector.pandas_tools import write_pandas
 import uuid
 from datetime import datetime
 
+from .resilience import CircuitBreaker, with_retry
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+EMBEDDING_MODEL = 'e5-base-v2'
+
+# Connection-level errors: retried with backoff and counted by the circuit
+# breaker. SQL/data errors (ProgrammingError etc.) are neither.
+TRANSIENT_ERRORS = (snowflake.connector.errors.OperationalError,)
+
+# Query-embedding cache bounds (Cortex is billed per call, dashboards repeat queries)
+QUERY_EMBEDDING_CACHE_SIZE = 4096
+QUERY_EMBEDDING_CACHE_TTL = 3600  # seconds
+
+# Columns written by store_filing_chunks (embedding is computed in-database)
+CHUNK_COLUMNS = """
+                id, ticker, company_name, filing_type, filing_date,
+                section_type, section_title, chunk_text,
+                sentence_idx, total_sentences, original_sentence"""
+
 
 class SnowflakeClient:
     """
@@ -31,7 +59,8 @@ class SnowflakeClient:
         warehouse: Optional[str] = None,
         database: Optional[str] = None,
         schema: Optional[str] = None,
-        role: Optional[str] = None
+        role: Optional[str] = None,
+        ensure_schema: bool = False
     ):
         """
         Initialize Snowflake client.
@@ -44,6 +73,9 @@ class SnowflakeClient:
             database: Snowflake database name
             schema: Snowflake schema name
             role: Snowflake role (optional)
+            ensure_schema: Create the database, schema and filings table if
+                missing. Off by default; run `python -m src.db.migrate` once
+                per deployment instead of paying the DDL on every start.
         """
         self.account = account or os.getenv('SNOWFLAKE_ACCOUNT')
         self.user = user or os.getenv('SNOWFLAKE_USER')
@@ -57,10 +89,15 @@ class SnowflakeClient:
             raise ValueError("Snowflake credentials must be provided via env vars or constructor")
         
         self.conn = None
+        self._breaker = CircuitBreaker('Snowflake', failure_types=TRANSIENT_ERRORS)
+        # blake2b(model, query_text) -> (expires_at, embedding), LRU ordered
+        self._query_embedding_cache: "OrderedDict[bytes, Tuple[float, List[float]]]" = OrderedDict()
+        self._query_embedding_lock = threading.Lock()
         self._connect()
-        self._ensure_schema()
+        if ensure_schema:
+            self._ensure_schema()
         
-        logger.info(f"[OK] SnowflakeClient initialized: {self.database}.{self.schema}")
+        logger.info("[OK] SnowflakeClient initialized: %s.%s", self.database, self.schema)
     
     def _connect(self):
         """Establish connection to Snowflake."""
@@ -71,42 +108,61 @@ class SnowflakeClient:
                 'password': self.password,
                 'warehouse': self.warehouse,
                 'database': self.database,
-                'schema': self.schema
+                'schema': self.schema,
+                # All statements bind values with ? placeholders
+                'paramstyle': 'qmark'
             }
             
             if self.role:
                 conn_params['role'] = self.role
             
             self.conn = snowflake.connector.connect(**conn_params)
-            logger.info(f"[OK] Connected to Snowflake: {self.account}")
+            logger.info("[OK] Connected to Snowflake: %s", self.account)
         except Exception as e:
-            logger.error(f"[ERROR] Failed to connect to Snowflake: {e}")
+            logger.error("[ERROR] Failed to connect to Snowflake: %s", e)
             raise
     
+    def _run_with_retry(self, func: Callable[[], T]) -> T:
+        """
+        Run a unit of Snowflake work with retries and the circuit breaker.
+        
+        Connection-level errors (TRANSIENT_ERRORS) are retried with backoff;
+        SQL errors are not. After repeated connection failures the breaker
+        rejects calls immediately so a bulk load does not wait out every
+        network timeout. SQL errors never open the circuit.
+        
+        Args:
+            func: Zero-argument callable that performs the statements
+        
+        Returns:
+            Result of func
+        """
+        return self._breaker.call(
+            lambda: with_retry(func, TRANSIENT_ERRORS)
+        )
+    
     def _ensure_schema(self):
         """Ensure database and schema exist, create if needed."""
         try:
-            cursor = self.conn.cursor()
-            
-            # Create database if not exists
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database}")
-            
-            # Use database
-            cursor.execute(f"USE DATABASE {self.database}")
-            
-            # Create schema if not exists
-            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {self.schema}")
-            
-            # Use schema
-            cursor.execute(f"USE SCHEMA {self.schema}")
+            with self.conn.cursor() as cursor:
+                # Create database if not exists
+                cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database}")
+                
+                # Use database
+                cursor.execute(f"USE DATABASE {self.database}")
+                
+                # Create schema if not exists
+                cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {self.schema}")
+                
+                # Use schema
+                cursor.execute(f"USE SCHEMA {self.schema}")
             
             # Create filings table if not exists
             self._create_filings_table()
             
-            cursor.close()
-            logger.info(f"[OK] Schema ensured: {self.database}.{self.schema}")
+            logger.info("[OK] Schema ensured: %s.%s", self.database, self.schema)
         except Exception as e:
-            logger.error(f"[ERROR] Failed to ensure schema: {e}")
+            logger.error("[ERROR] Failed to ensure schema: %s", e)
             raise
     
     def _create_filings_table(self):
@@ -127,15 +183,18 @@ class SnowflakeClient:
             embedding VECTOR(FLOAT, 768),
             created_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
         )
+        CLUSTER BY (ticker)
         """
         
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(create_table_sql)
-            cursor.close()
-            logger.info(f"[OK] Filings table created/verified")
+            with self.conn.cursor() as cursor:
+                cursor.execute(create_table_sql)
+                # Tables created before clustering was added; lets ticker-filtered
+                # searches prune micro-partitions
+                cursor.execute(f"ALTER TABLE {self.schema}.filings CLUSTER BY (ticker)")
+            logger.info("[OK] Filings table created/verified")
         except Exception as e:
-            logger.error(f"[ERROR] Failed to create filings table: {e}")
+            logger.error("[ERROR] Failed to create filings table: %s", e)
             raise
     
     def store_filing_chunks(
@@ -145,7 +204,7 @@ class SnowflakeClient:
         chunks: List[Dict[str, Any]]
     ) -> int:
         """
-        Store filing chunks in Snowflake.
+        Store filing chunks in Snowflake with their Cortex embeddings.
         
         Args:
             ticker: Company ticker symbol
@@ -161,72 +220,142 @@ class SnowflakeClient:
                 - original_sentence: original sentence text
         
         Returns:
-            Number of chunks stored
+            Number of new chunks stored (chunks whose id already exists are skipped)
         """
         if not chunks:
             logger.warning("[WARN] No chunks to store")
             return 0
         
-        logger.info(f"[INFO] Storing {len(chunks)} chunks for {ticker}")
+        logger.info("[INFO] Storing %s chunks for %s", len(chunks), ticker)
         
         try:
-            cursor = self.conn.cursor()
-            
-            insert_sql = f"""
-            INSERT INTO {self.schema}.filings (
-                id, ticker, company_name, filing_type, filing_date,
-                section_type, section_title, chunk_text,
-                sentence_idx, total_sentences, original_sentence
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            # Rows are bulk-loaded into a session-scoped staging table, then
+            # merged into filings on id. Only rows not already present are
+            # inserted, and the Cortex embedding is evaluated in the insert
+            # branch, so re-ingesting a filing neither duplicates chunks nor
+            # re-embeds them.
+            source_columns = ", ".join(f"s.{c.strip()}" for c in CHUNK_COLUMNS.split(","))
+            merge_sql = f"""
+            MERGE INTO {self.schema}.filings t
+            USING {self.schema}.filings_stage s
+            ON t.id = s.id
+            WHEN NOT MATCHED THEN INSERT ({CHUNK_COLUMNS},
+                embedding
+            ) VALUES ({source_columns},
+                SNOWFLAKE.CORTEX.EMBED_TEXT_768('{EMBEDDING_MODEL}', s.chunk_text)
+            )
             """
             
-            stored_count = 0
-            for chunk in chunks:
-                chunk_id = f"{ticker}_{chunk.get('section_type', 'unknown')}_{chunk.get('sentence_idx', 0)}"
-                
-                # Generate embedding using Cortex
-                chunk_text = chunk.get('text', chunk.get('chunk_text', ''))
-                if not chunk_text:
-                    logger.warning(f"[WARN] Skipping chunk with no text")
-                    continue
-                
-                try:
-                    cursor.execute(insert_sql, (
-                        chunk_id,
-                        ticker,
-                        company_name,
-                        chunk.get('filing_type', 'N/A'),
-                        chunk.get('filing_date'),
-                        chunk.get('section_type', 'unknown'),
-                        chunk.get('section_title', ''),
-                        chunk_text,
-                        chunk.get('sentence_idx', 0),
-                        chunk.get('total_sentences', 0),
-                        chunk.get('original_sentence', chunk_text)
-                    ))
-                    stored_count += 1
-                except Exception as e:
-                    logger.warning(f"[WARN] Failed to insert chunk: {e}")
-                    continue
-            
-            cursor.close()
-            logger.info(f"[OK] Stored {stored_count} chunks for {ticker}")
-            
-            # Generate embeddings for newly inserted chunks
-            if stored_count > 0:
-                self.generate_embeddings(ticker)
+            df = self._chunks_to_frame(ticker, company_name, chunks)
+            skipped = len(chunks) - len(df)
+            if skipped:
+                logger.warning("[WARN] Skipping %s chunks with no text", skipped)
+            
+            def load() -> int:
+                with self.conn.cursor() as cursor:
+                    cursor.execute(
+                        f"CREATE TEMPORARY TABLE IF NOT EXISTS {self.schema}.filings_stage "
+                        f"LIKE {self.schema}.filings"
+                    )
+                    cursor.execute(f"TRUNCATE TABLE {self.schema}.filings_stage")
+                    # write_pandas stages the frame as Parquet and COPYs it in,
+                    # instead of binding the rows one by one
+                    success, _, nrows, _ = write_pandas(
+                        self.conn,
+                        df,
+                        'FILINGS_STAGE',
+                        schema=self.schema,
+                        quote_identifiers=False
+                    )
+                    if not success:
+                        raise RuntimeError(f"write_pandas loaded {nrows} of {len(df)} rows")
+                    cursor.execute(merge_sql)
+                    return cursor.rowcount
+            
+            stored_count = self._run_with_retry(load) if len(df) else 0
+            logger.info("[OK] Stored and embedded %s new chunks for %s", stored_count, ticker)
             
             return stored_count
             
         except Exception as e:
-            logger.error(f"[ERROR] Failed to store chunks: {e}", exc_info=True)
+            logger.error("[ERROR] Failed to store chunks: %s", e, exc_info=True)
             raise
     
+    @staticmethod
+    def _chunks_to_frame(
+        ticker: str,
+        company_name: str,
+        chunks: List[Dict[str, Any]]
+    ) -> pd.DataFrame:
+        """
+        Convert chunk dicts to a column-oriented frame matching CHUNK_COLUMNS.
+        
+        Defaults and fallbacks are applied per column rather than per row.
+        Chunks with no text are dropped. Ids are deterministic per chunk, so
+        re-ingesting a filing maps onto the rows already stored.
+        
+        Args:
+            ticker: Company ticker symbol
+            company_name: Company name
+            chunks: Chunk dictionaries as accepted by store_filing_chunks
+        
+        Returns:
+            DataFrame with one column per entry in CHUNK_COLUMNS
+        """
+        raw = pd.DataFrame.from_records(chunks)
+        
+        def column(name: str, default: Any = None) -> pd.Series:
+            if name in raw:
+                return raw[name] if default is None else raw[name].fillna(default)
+            return pd.Series([default] * len(raw), index=raw.index, dtype=object)
+        
+        text = column('text').combine_first(column('chunk_text'))
+        section_type = column('section_type', 'unknown')
+        sentence_idx = column('sentence_idx', 0).astype('int64')
+        filing_date = column('filing_date')
+        
+        filing_type = column('filing_type', 'N/A')
+        section_title = column('section_title', '')
+        
+        # section_type is a coarse bucket and sentence_idx restarts per
+        # section, so the id also digests the filing, the section title and
+        # the text to stay unique across sections and filings of one ticker
+        key_parts = zip(
+            filing_type.astype(str), filing_date.fillna('').astype(str),
+            section_title.astype(str), text.fillna('').astype(str)
+        )
+        digests = [
+            hashlib.blake2b('\0'.join(parts).encode('utf-8'), digest_size=8).hexdigest()
+            for parts in key_parts
+        ]
+        
+        df = pd.DataFrame({
+            'id': (
+                ticker + '_' + section_type.astype(str) + '_' + sentence_idx.astype(str)
+                + '_' + pd.Series(digests, index=raw.index, dtype=object)
+            ),
+            'ticker': ticker,
+            'company_name': company_name,
+            'filing_type': filing_type,
+            'filing_date': filing_date.where(filing_date != '', None),
+            'section_type': section_type,
+            'section_title': section_title,
+            'chunk_text': text,
+            'sentence_idx': sentence_idx,
+            'total_sentences': column('total_sentences', 0).astype('int64'),
+            'original_sentence': column('original_sentence').combine_first(text),
+        })
+        
+        has_text = text.notna() & (text != '')
+        return df[has_text].reset_index(drop=True)
+    
     def generate_embeddings(self, ticker: Optional[str] = None) -> int:
         """
         Generate embeddings for chunks that don't have embeddings yet.
         
-        Uses Snowflake Cortex EMBED_TEXT_768 function.
+        Uses Snowflake Cortex EMBED_TEXT_768 function. store_filing_chunks
+        embeds rows as it inserts them, so this is only needed to backfill
+        rows stored without an embedding.
         
         Args:
             ticker: Optional ticker to limit embedding generation
@@ -234,31 +363,35 @@ class SnowflakeClient:
         Returns:
             Number of embeddings generated
         """
-        logger.info(f"[INFO] Generating embeddings for {ticker or 'all companies'}")
+        logger.info("[INFO] Generating embeddings for %s", ticker or 'all companies')
         
         try:
-            cursor = self.conn.cursor()
-            
             # Update chunks without embeddings
             where_clause = "WHERE embedding IS NULL"
+            params: Tuple[Any, ...] = ()
             if ticker:
-                where_clause += f" AND ticker = '{ticker}'"
+                where_clause += " AND ticker = ?"
+                params = (ticker,)
             
             update_sql = f"""
             UPDATE {self.schema}.filings
-            SET embedding = SNOWFLAKE.CORTEX.EMBED_TEXT_768('e5-base-v2', chunk_text)
+            SET embedding = SNOWFLAKE.CORTEX.EMBED_TEXT_768('{EMBEDDING_MODEL}', chunk_text)
             {where_clause}
             """
             
-            cursor.execute(update_sql)
-            updated_count = cursor.rowcount
-            cursor.close()
+            def update() -> int:
+                with self.conn.cursor() as cursor:
+                    cursor.execute(update_sql, params)
+                    return cursor.rowcount
             
-            logger.info(f"[OK] Generated {updated_count} embeddings")
+            # Only touches rows WHERE embedding IS NULL, so a retry is safe
+            updated_count = self._run_with_retry(update)
+            
+            logger.info("[OK] Generated %s embeddings", updated_count)
             return updated_count
             
         except Exception as e:
-            logger.error(f"[ERROR] Failed to generate embeddings: {e}", exc_info=True)
+            logger.error("[ERROR] Failed to generate embeddings: %s", e, exc_info=True)
             raise
     
     def similarity_search(
@@ -280,51 +413,52 @@ class SnowflakeClient:
         Returns:
             List of matching chunks with similarity scores
         """
-        logger.info(f"[INFO] Similarity search: query='{query_text[:50]}...', ticker={ticker}, top_k={top_k}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[INFO] Similarity search: query='%s...', ticker=%s, top_k=%s", query_text[:50], ticker, top_k)
         
         try:
-            cursor = self.conn.cursor(DictCursor)
-            
-            # Generate query embedding
-            query_embedding_sql = f"""
-            SELECT SNOWFLAKE.CORTEX.EMBED_TEXT_768('e5-base-v2', ?) AS query_embedding
-            """
-            cursor.execute(query_embedding_sql, (query_text,))
-            query_result = cursor.fetchone()
-            
-            if not query_result or not query_result['QUERY_EMBEDDING']:
-                logger.error("[ERROR] Failed to generate query embedding")
-                return []
-            
-            query_embedding = query_result['QUERY_EMBEDDING']
-            
-            # Build search query
-            where_clause = "WHERE embedding IS NOT NULL"
+            # The query vector comes from the cache, or from one Cortex call
+            # that is then cached whatever the search returns, and is bound
+            # into the scan. Values are bound so the statement text is
+            # identical across queries, tickers and thresholds.
+            cache_key = self._query_embedding_key(query_text)
+            query_embedding = self._get_cached_query_embedding(cache_key)
+            if query_embedding is None:
+                query_embedding = self._embed_query(query_text)
+                self._cache_query_embedding(cache_key, query_embedding)
+            
+            params: List[Any] = [json.dumps(query_embedding)]
+            where_clause = "WHERE f.embedding IS NOT NULL"
             if ticker:
-                where_clause += f" AND ticker = '{ticker}'"
+                where_clause += " AND f.ticker = ?"
+                params.append(ticker)
+            params.append(float(min_similarity))
             
             search_sql = f"""
+            WITH q AS (
+                SELECT PARSE_JSON(?)::VECTOR(FLOAT, 768) AS query_embedding
+            )
             SELECT 
-                id,
-                ticker,
-                company_name,
-                filing_type,
-                filing_date,
-                section_type,
-                section_title,
-                chunk_text,
-                original_sentence,
-                VECTOR_COSINE_SIMILARITY(embedding, ?) AS similarity
-            FROM {self.schema}.filings
+                f.id,
+                f.ticker,
+                f.company_name,
+                f.filing_type,
+                f.filing_date,
+                f.section_type,
+                f.section_title,
+                f.chunk_text,
+                f.original_sentence,
+                VECTOR_COSINE_SIMILARITY(f.embedding, q.query_embedding) AS similarity
+            FROM {self.schema}.filings f, q
             {where_clause}
-            QUALIFY similarity >= {min_similarity}
+            QUALIFY similarity >= ?
             ORDER BY similarity DESC
-            LIMIT {top_k}
+            LIMIT {int(top_k)}
             """
             
-            cursor.execute(search_sql, (query_embedding,))
-            results = cursor.fetchall()
-            cursor.close()
+            with self.conn.cursor(DictCursor) as cursor:
+                cursor.execute(search_sql, params)
+                results = cursor.fetchall()
             
             # Format results
             formatted_results = []
@@ -342,17 +476,55 @@ class SnowflakeClient:
                     'similarity': float(row['SIMILARITY'])
                 })
             
-            logger.info(f"[OK] Found {len(formatted_results)} similar chunks")
+            logger.info("[OK] Found %s similar chunks", len(formatted_results))
             return formatted_results
             
         except Exception as e:
-            logger.error(f"[ERROR] Similarity search failed: {e}", exc_info=True)
+            logger.error("[ERROR] Similarity search failed: %s", e, exc_info=True)
             raise
     
+    def _embed_query(self, query_text: str) -> List[float]:
+        """Embed query text with Cortex (one 768-float row)."""
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                f"SELECT SNOWFLAKE.CORTEX.EMBED_TEXT_768('{EMBEDDING_MODEL}', ?)",
+                [query_text]
+            )
+            return [float(x) for x in cursor.fetchone()[0]]
+    
+    def _query_embedding_key(self, query_text: str) -> bytes:
+        """Cache key for a query embedding (model + text digest)."""
+        return hashlib.blake2b(
+            f"{EMBEDDING_MODEL}\0{query_text}".encode('utf-8'),
+            digest_size=16
+        ).digest()
+    
+    def _get_cached_query_embedding(self, key: bytes) -> Optional[List[float]]:
+        """Return a cached, unexpired query embedding or None."""
+        with self._query_embedding_lock:
+            entry = self._query_embedding_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, embedding = entry
+            if expires_at < time.monotonic():
+                del self._query_embedding_cache[key]
+                return None
+            self._query_embedding_cache.move_to_end(key)
+            return embedding
+    
+    def _cache_query_embedding(self, key: bytes, embedding: List[float]):
+        """Store a query embedding, evicting the least recently used entry."""
+        with self._query_embedding_lock:
+            self._query_embedding_cache[key] = (time.monotonic() + QUERY_EMBEDDING_CACHE_TTL, embedding)
+            self._query_embedding_cache.move_to_end(key)
+            while len(self._query_embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embedding_cache.popitem(last=False)
+    
     def get_company_chunks(
         self,
         ticker: str,
-        section_type: Optional[str] = None
+        section_type: Optional[str] = None,
+        include_embedding: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Retrieve all chunks for a company.
@@ -360,20 +532,53 @@ class SnowflakeClient:
         Args:
             ticker: Company ticker
             section_type: Optional section type filter
+            include_embedding: Also fetch the 768-dim embedding of each chunk
         
         Returns:
             List of chunk dictionaries
         """
-        logger.info(f"[INFO] Retrieving chunks for {ticker}")
+        chunks = list(self.get_company_chunks_iter(ticker, section_type, include_embedding))
+        logger.info("[OK] Retrieved %s chunks for %s", len(chunks), ticker)
+        return chunks
+    
+    def get_company_chunks_iter(
+        self,
+        ticker: str,
+        section_type: Optional[str] = None,
+        include_embedding: bool = False,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream chunks for a company without materializing the full result.
         
-        try:
-            cursor = self.conn.cursor(DictCursor)
-            
-            where_clause = f"WHERE ticker = '{ticker}'"
-            if section_type:
-                where_clause += f" AND section_type = '{section_type}'"
-            
-            select_sql = f"""
+        Rows are fetched from the cursor in batches of batch_size, so memory
+        stays bounded for tickers with thousands of chunks.
+        
+        Args:
+            ticker: Company ticker
+            section_type: Optional section type filter
+            include_embedding: Also fetch the 768-dim embedding of each chunk
+                (about 3 KB per row; leave off when only text is needed). The
+                rows are then read as Arrow result batches and each
+                'embedding' is a float32 numpy row of the batch's matrix,
+                not a Python list of floats. Requires pyarrow.
+            batch_size: Rows fetched per round-trip (without embeddings;
+                Arrow batches are sized by the server)
+        
+        Yields:
+            Chunk dictionaries
+        """
+        logger.info("[INFO] Retrieving chunks for %s", ticker)
+        
+        where_clause = "WHERE ticker = ?"
+        params: List[Any] = [ticker]
+        if section_type:
+            where_clause += " AND section_type = ?"
+            params.append(section_type)
+        
+        embedding_column = ",\n                embedding" if include_embedding else ""
+        
+        select_sql = f"""
             SELECT 
                 id,
                 ticker,
@@ -385,47 +590,78 @@ class SnowflakeClient:
                 chunk_text,
                 original_sentence,
                 sentence_idx,
-                total_sentences,
-                embedding
+                total_sentences{embedding_column}
             FROM {self.schema}.filings
             {where_clause}
             ORDER BY filing_date DESC, section_type, sentence_idx
             """
-            
-            cursor.execute(select_sql)
-            results = cursor.fetchall()
-            cursor.close()
-            
-            # Format results
-            chunks = []
-            for row in results:
-                chunk = {
-                    'doc_id': row['ID'],
-                    'ticker': row['TICKER'],
-                    'company_name': row['COMPANY_NAME'],
-                    'filing_type': row['FILING_TYPE'],
-                    'filing_date': str(row['FILING_DATE']) if row['FILING_DATE'] else None,
-                    'section_type': row['SECTION_TYPE'],
-                    'section_title': row['SECTION_TITLE'],
-                    'text': row['CHUNK_TEXT'],
-                    'original_sentence': row['ORIGINAL_SENTENCE'],
-                    'sentence_idx': row['SENTENCE_IDX'],
-                    'total_sentences': row['TOTAL_SENTENCES']
-                }
-                
-                # Include embedding if available
-                if row['EMBEDDING']:
-                    chunk['embedding'] = row['EMBEDDING']
-                
-                chunks.append(chunk)
-            
-            logger.info(f"[OK] Retrieved {len(chunks)} chunks for {ticker}")
-            return chunks
-            
+        
+        try:
+            if include_embedding:
+                with self.conn.cursor() as cursor:
+                    cursor.execute(select_sql, params)
+                    for table in cursor.fetch_arrow_batches():
+                        yield from self._arrow_batch_to_chunks(table)
+            else:
+                with self.conn.cursor(DictCursor) as cursor:
+                    cursor.execute(select_sql, params)
+                    
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        
+                        for row in rows:
+                            yield self._row_to_chunk(row)
+                        
         except Exception as e:
-            logger.error(f"[ERROR] Failed to retrieve chunks: {e}", exc_info=True)
+            logger.error("[ERROR] Failed to retrieve chunks: %s", e, exc_info=True)
             raise
     
+    @staticmethod
+    def _row_to_chunk(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a filings row (upper-case column keys) to a chunk dict."""
+        return {
+            'doc_id': row['ID'],
+            'ticker': row['TICKER'],
+            'company_name': row['COMPANY_NAME'],
+            'filing_type': row['FILING_TYPE'],
+            'filing_date': str(row['FILING_DATE']) if row['FILING_DATE'] else None,
+            'section_type': row['SECTION_TYPE'],
+            'section_title': row['SECTION_TITLE'],
+            'text': row['CHUNK_TEXT'],
+            'original_sentence': row['ORIGINAL_SENTENCE'],
+            'sentence_idx': row['SENTENCE_IDX'],
+            'total_sentences': row['TOTAL_SENTENCES']
+        }
+    
+    def _arrow_batch_to_chunks(self, table) -> Iterator[Dict[str, Any]]:
+        """
+        Convert one Arrow result batch to chunk dicts with float32 embeddings.
+        
+        The VECTOR(FLOAT, 768) column is a fixed-size list column: flattening
+        it yields the row-major values of every non-null embedding, which
+        reshape into one (N, 768) float32 matrix without a per-row copy.
+        Rows without an embedding get no 'embedding' key, as before.
+        """
+        embeddings = table.column('EMBEDDING').combine_chunks()
+        missing = embeddings.is_null().to_numpy(zero_copy_only=False)
+        matrix = (
+            embeddings.flatten()
+            .to_numpy(zero_copy_only=False)
+            .astype(np.float32, copy=False)
+            .reshape(-1, 768)
+        )
+        
+        text_columns = [name for name in table.column_names if name != 'EMBEDDING']
+        next_vector = 0
+        for row, is_missing in zip(table.select(text_columns).to_pylist(), missing):
+            chunk = self._row_to_chunk(row)
+            if not is_missing:
+                chunk['embedding'] = matrix[next_vector]
+                next_vector += 1
+            yield chunk
+    
     def delete_company_chunks(self, ticker: str) -> int:
         """
         Delete all chunks for a company.
@@ -436,21 +672,19 @@ class SnowflakeClient:
         Returns:
             Number of chunks deleted
         """
-        logger.info(f"[INFO] Deleting chunks for {ticker}")
+        logger.info("[INFO] Deleting chunks for %s", ticker)
         
         try:
-            cursor = self.conn.cursor()
-            
             delete_sql = f"DELETE FROM {self.schema}.filings WHERE ticker = ?"
-            cursor.execute(delete_sql, (ticker,))
-            deleted_count = cursor.rowcount
-            cursor.close()
+            with self.conn.cursor() as cursor:
+                cursor.execute(delete_sql, (ticker,))
+                deleted_count = cursor.rowcount
             
-            logger.info(f"[OK] Deleted {deleted_count} chunks for {ticker}")
+            logger.info("[OK] Deleted %s chunks for %s", deleted_count, ticker)
             return deleted_count
             
         except Exception as e:
-            logger.error(f"[ERROR] Failed to delete chunks: {e}", exc_info=True)
+            logger.error("[ERROR] Failed to delete chunks: %s", e, exc_info=True)
             raise
     
     def close(self):
@@ -2,20 +2,43 @@
 Text processing and normalization for embeddings.
 """
 
+import hashlib
 import re
+from array import array
+from bisect import bisect_right
 import logging
-from typing import List, Dict, Any, Optional
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, islice
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
+try:
+    from selectolax.parser import HTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
 try:
     from bs4 import BeautifulSoup
     HAS_BS4 = True
 except ImportError:
     HAS_BS4 = False
-    logging.warning("[WARN] beautifulsoup4 not available, skipping HTML cleanup")
+    if not HAS_SELECTOLAX:
+        logging.warning("[WARN] beautifulsoup4 not available, skipping HTML cleanup")
+
+# BeautifulSoup uses the C-backed lxml parser when it is installed
+try:
+    import lxml
+    BS4_PARSER = "lxml"
+except ImportError:
+    BS4_PARSER = "html.parser"
 
 try:
     import spacy
+    from spacy.attrs import LEMMA, ORTH, IS_STOP, IS_PUNCT
+    from spacy.tokens import Doc
     HAS_SPACY = True
 except ImportError:
     HAS_SPACY = False
@@ -30,13 +53,53 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Cleaned texts kept per processor; filings repeat boilerplate sections
+# (safe harbor, definitions, signatures) across companies and quarters
+SPACY_CACHE_SIZE = 20000
+# Surface form -> lemma entries kept when lemmas do not depend on context
+LEMMA_CACHE_SIZE = 200000
+
+# Strings shorter than this are checked for the normalize() no-op fast path
+NORMALIZE_FAST_PATH_MAX_LEN = 256
+
+# Sentence boundary for the simple chunker: whitespace after ., ! or ?
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+
+def _html_to_text(text: str) -> str:
+    """
+    Extract plain text from HTML (module-level so worker processes can run it).
+    
+    Args:
+        text: HTML text
+        
+    Returns:
+        Cleaned plain text
+    """
+    if HAS_SELECTOLAX:
+        try:
+            return HTMLParser(text).text(separator=" ", strip=True)
+        except Exception as e:
+            logger.warning(f"[WARN] selectolax HTML cleanup failed, trying BeautifulSoup: {e}")
+    
+    if not HAS_BS4:
+        logger.warning("[WARN] BeautifulSoup not available, skipping HTML cleanup")
+        return text
+    
+    try:
+        soup = BeautifulSoup(text, BS4_PARSER)
+        return soup.get_text(separator=" ", strip=True)
+    except Exception as e:
+        logger.warning(f"[WARN] HTML cleanup failed: {e}")
+        return text
+
 
 class TextProcessor:
     """
     Process and normalize text for embeddings.
     
     Features:
-    - HTML cleanup (BeautifulSoup)
+    - HTML cleanup (selectolax or BeautifulSoup)
     - Text normalization (lowercase, whitespace, special chars)
     - Optional spaCy NLP (lemmatization, stop words)
     - Document chunking (RecursiveCharacterTextSplitter or fallback)
@@ -49,7 +112,9 @@ class TextProcessor:
         chunk_overlap: int = 50,  # Overlap for context preservation
         normalize_text: bool = True,
         use_contextual_enrichment: bool = False,
-        knowledge_db=None
+        knowledge_db=None,
+        spacy_batch_size: Optional[int] = None,
+        n_process: int = 1
     ):
         """
         Initialize text processor.
@@ -61,6 +126,11 @@ class TextProcessor:
             normalize_text: Whether to normalize text (lowercase, etc.)
             use_contextual_enrichment: Whether to add domain context to chunks
             knowledge_db: Optional CompanyKnowledgeDB instance for rich company context
+            spacy_batch_size: Texts per spaCy nlp.pipe batch (default: SPACY_BATCH_SIZE env var or 64)
+            n_process: Worker processes for HTML cleanup across sections (default: 1).
+                With the default blank/lookup spaCy pipeline, spaCy cleaning
+                stays in this process (it is tokenizer-bound and cached); only
+                the en_core_web_sm fallback also passes it to nlp.pipe.
         """
         self.use_spacy = use_spacy and HAS_SPACY
         self.chunk_size = chunk_size
@@ -68,6 +138,13 @@ class TextProcessor:
         self.normalize_text = normalize_text
         self.use_contextual_enrichment = use_contextual_enrichment
         self.knowledge_db = knowledge_db
+        self.spacy_batch_size = spacy_batch_size or int(os.getenv('SPACY_BATCH_SIZE', '64'))
+        self.n_process = max(1, n_process)
+        # HTML cleanup worker pool, created on first use and reused across
+        # documents; released by close()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # blake2b(text) -> spaCy-cleaned text, LRU ordered
+        self._spacy_cache: "OrderedDict[bytes, str]" = OrderedDict()
         
         # Initialize contextual enricher if requested
         self.enricher = None
@@ -82,14 +159,15 @@ class TextProcessor:
         
         # Initialize spaCy if requested
         self.nlp = None
+        # ORTH hash -> lemma; only used with the context-free lookup lemmatizer
+        self._lemma_cache: Optional[Dict[int, str]] = None
         if self.use_spacy:
-            try:
-                self.nlp = spacy.load("en_core_web_sm")
-                logger.info("[INFO] Loaded spaCy model: en_core_web_sm")
-            except OSError:
+            self.nlp, context_free = self._load_spacy()
+            if context_free:
+                self._lemma_cache = {}
+            if self.nlp is None:
                 logger.warning("[WARN] spaCy model not found, falling back to basic processing")
                 self.use_spacy = False
-                self.nlp = None
         
         # Initialize chunker
         if HAS_LANGCHAIN:
@@ -104,26 +182,51 @@ class TextProcessor:
             self.chunker = None
             logger.info("[INFO] Using simple chunking (langchain not available)")
     
+    @staticmethod
+    def _load_spacy():
+        """
+        Load the lightest spaCy pipeline that provides lemmas and stop words.
+        
+        clean_with_spacy only reads token.lemma_, is_stop and is_punct, so a
+        blank English pipeline with a lookup lemmatizer is enough and avoids
+        running tok2vec/tagger per token. The lookup tables come from
+        spacy-lookups-data; without them, fall back to en_core_web_sm with
+        the unused parser and NER disabled.
+        
+        Returns:
+            Tuple of (spaCy Language object or None if neither pipeline is
+            available, whether lemmas are context-free lookups)
+        """
+        try:
+            nlp = spacy.blank("en")
+            nlp.add_pipe("lemmatizer", config={"mode": "lookup"})
+            nlp.initialize()
+            logger.info("[INFO] Loaded spaCy blank pipeline with lookup lemmatizer")
+            return nlp, True
+        except Exception as e:
+            logger.info(f"[INFO] spaCy lookup lemmatizer unavailable ({e}), trying en_core_web_sm")
+        
+        try:
+            nlp = spacy.load("en_core_web_sm", disable=["parser", "ner"])
+            logger.info("[INFO] Loaded spaCy model: en_core_web_sm")
+            return nlp, False
+        except OSError:
+            return None, False
+    
     def clean_html(self, text: str) -> str:
         """
         Remove HTML tags and extract text.
         
+        Uses selectolax when installed, otherwise BeautifulSoup with lxml
+        (falling back to the pure-Python html.parser).
+        
         Args:
             text: HTML text
             
         Returns:
             Cleaned plain text
         """
-        if not HAS_BS4:
-            logger.warning("[WARN] BeautifulSoup not available, skipping HTML cleanup")
-            return text
-        
-        try:
-            soup = BeautifulSoup(text, "html.parser")
-            return soup.get_text(separator=" ", strip=True)
-        except Exception as e:
-            logger.warning(f"[WARN] HTML cleanup failed: {e}")
-            return text
+        return _html_to_text(text)
     
     def normalize(self, text: str) -> str:
         """
@@ -135,11 +238,25 @@ class TextProcessor:
         Returns:
             Normalized text
         """
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
+        # Common case first: short strings that are already clean (titles,
+        # CSV fields) come back unchanged without a split/join. isprintable()
+        # rules out tabs, newlines and non-ASCII spaces, so single ' ' is the
+        # only whitespace left to check
+        if (
+            len(text) < NORMALIZE_FAST_PATH_MAX_LEN
+            and text.isprintable()
+            and "  " not in text
+            and text[:1] != " "
+            and text[-1:] != " "
+            and (not self.normalize_text or text.islower())
+        ):
+            return text
+        
+        # Collapse whitespace runs and trim in one pass (str.split() with no
+        # argument splits on any whitespace and drops leading/trailing runs)
+        text = " ".join(text.split())
         
-        # Optionally lowercase
+        # Optionally lowercase (after trimming, so less text is lowercased)
         if self.normalize_text:
             text = text.lower()
         
@@ -158,16 +275,150 @@ class TextProcessor:
         if not self.use_spacy or not self.nlp:
             return text
         
+        key = self._spacy_cache_key(text)
+        cached = self._get_cached_spacy(key)
+        if cached is not None:
+            return cached
+        
         try:
-            doc = self.nlp(text)
-            tokens = []
-            for token in doc:
-                if not token.is_stop and not token.is_punct:
-                    tokens.append(token.lemma_)
-            return " ".join(tokens)
+            cleaned = next(self._clean_with_spacy_iter([text], n_process=1))
         except Exception as e:
             logger.warning(f"[WARN] spaCy processing failed: {e}")
             return text
+        
+        self._cache_spacy(key, cleaned)
+        return cleaned
+    
+    def clean_texts_with_spacy(self, texts: List[str]) -> List[str]:
+        """
+        Batched clean_with_spacy over many texts using nlp.pipe.
+        
+        Texts already in the cache are not sent through spaCy again.
+        
+        Args:
+            texts: Input texts
+            
+        Returns:
+            Cleaned texts, in input order
+        """
+        if not self.use_spacy or not self.nlp:
+            return list(texts)
+        
+        keys = [self._spacy_cache_key(text) for text in texts]
+        results = [self._get_cached_spacy(key) for key in keys]
+        # Repeated texts within this batch are processed once
+        misses: Dict[bytes, List[int]] = {}
+        for i, result in enumerate(results):
+            if result is None:
+                misses.setdefault(keys[i], []).append(i)
+        
+        if misses:
+            try:
+                cleaned_texts = self._clean_with_spacy_iter(
+                    (texts[positions[0]] for positions in misses.values()),
+                    n_process=self.n_process
+                )
+                for (key, positions), cleaned in zip(misses.items(), cleaned_texts):
+                    self._cache_spacy(key, cleaned)
+                    for i in positions:
+                        results[i] = cleaned
+            except Exception as e:
+                logger.warning(f"[WARN] spaCy processing failed: {e}")
+                return list(texts)
+        
+        return results
+    
+    def _clean_with_spacy_iter(self, texts: Iterable[str], n_process: int) -> Iterator[str]:
+        """
+        Run texts through spaCy and yield the cleaned strings in order.
+        
+        With the lookup lemmatizer a word's lemma does not depend on its
+        context, so only the tokenizer runs per text and each distinct word
+        is lemmatized once (see _lemmatize_unique). Otherwise the full
+        pipeline runs via nlp.pipe.
+        
+        Args:
+            texts: Input texts
+            n_process: Worker processes for nlp.pipe
+            
+        Yields:
+            Cleaned texts
+        """
+        if self._lemma_cache is not None:
+            for doc in self.nlp.tokenizer.pipe(texts, batch_size=self.spacy_batch_size):
+                yield self._lemmatize_unique(doc)
+        else:
+            for doc in self.nlp.pipe(texts, batch_size=self.spacy_batch_size, n_process=n_process):
+                yield self._lemmatize_doc(doc)
+    
+    def _lemmatize_unique(self, doc) -> str:
+        """
+        Lemmatize a tokenized Doc, running the lemmatizer only on unseen words.
+        
+        Filings repeat the same vocabulary heavily, so the per-word lemma
+        cache turns an O(tokens) lemmatizer pass into O(new words).
+        
+        Args:
+            doc: Tokenizer-only spaCy Doc
+            
+        Returns:
+            Lemmas of non-stop, non-punctuation tokens joined by spaces
+        """
+        strings = doc.vocab.strings
+        kept = [
+            orth
+            for orth, is_stop, is_punct in doc.to_array([ORTH, IS_STOP, IS_PUNCT]).tolist()
+            if not is_stop and not is_punct
+        ]
+        
+        cache = self._lemma_cache
+        unseen = {orth for orth in kept if orth not in cache}
+        if unseen:
+            if len(cache) + len(unseen) > LEMMA_CACHE_SIZE:
+                cache.clear()
+                unseen = set(kept)
+            unseen = list(unseen)
+            words = Doc(doc.vocab, words=[strings[orth] for orth in unseen])
+            for _, component in self.nlp.pipeline:
+                words = component(words)
+            for orth, lemma in zip(unseen, words.to_array([LEMMA]).tolist()):
+                cache[orth] = strings[lemma]
+        
+        return " ".join(cache[orth] for orth in kept)
+    
+    @staticmethod
+    def _spacy_cache_key(text: str) -> bytes:
+        """Fixed-size cache key, so long sections are not held twice in memory."""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    
+    def _get_cached_spacy(self, key: bytes) -> Optional[str]:
+        """Return cached cleaned text, refreshing its LRU position."""
+        cleaned = self._spacy_cache.get(key)
+        if cleaned is not None:
+            self._spacy_cache.move_to_end(key)
+        return cleaned
+    
+    def _cache_spacy(self, key: bytes, cleaned: str):
+        """Store cleaned text, evicting the least recently used entry when full."""
+        self._spacy_cache[key] = cleaned
+        self._spacy_cache.move_to_end(key)
+        if len(self._spacy_cache) > SPACY_CACHE_SIZE:
+            self._spacy_cache.popitem(last=False)
+    
+    @staticmethod
+    def _lemmatize_doc(doc) -> str:
+        """
+        Join lemmas of a spaCy Doc, dropping stop words and punctuation.
+        
+        Reads all three attributes in one Doc.to_array call instead of three
+        Python attribute accesses per token.
+        """
+        strings = doc.vocab.strings
+        return " ".join(
+            strings[lemma]
+            for lemma, is_stop, is_punct in doc.to_array([LEMMA, IS_STOP, IS_PUNCT]).tolist()
+            if not is_stop and not is_punct
+        )
     
     def chunk_text(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
@@ -180,29 +431,32 @@ class TextProcessor:
         Returns:
             List of chunks with metadata
         """
-        if self.chunker:
+        if self.chunker and len(text) <= self.chunk_size:
+            # Fits in one chunk: the splitter's separator passes would only
+            # hand back the stripped text, so skip them
+            stripped = text.strip()
+            chunks = [stripped] if stripped else []
+        elif self.chunker:
             # Use langchain's advanced chunking
             chunks = self.chunker.split_text(text)
         else:
             # Simple chunking fallback
             chunks = self._simple_chunk(text)
         
-        # Add metadata to each chunk
-        result = []
-        for i, chunk in enumerate(chunks):
-            chunk_data = {
+        # Add metadata to each chunk. Callers mutate chunk dicts (enrichment,
+        # renumbering, embeddings), so each chunk gets its own dict, built in
+        # one literal rather than created and then grown with update()
+        metadata = metadata or {}
+        total_chunks = len(chunks)
+        return [
+            {
                 "text": chunk,
                 "chunk_index": i,
-                "total_chunks": len(chunks)
+                "total_chunks": total_chunks,
+                **metadata
             }
-            
-            # Add provided metadata
-            if metadata:
-                chunk_data.update(metadata)
-            
-            result.append(chunk_data)
-        
-        return result
+            for i, chunk in enumerate(chunks)
+        ]
     
     def _simple_chunk(self, text: str) -> List[str]:
         """
@@ -215,27 +469,20 @@ class TextProcessor:
             List of text chunks
         """
         # Split by sentences (., !, ?)
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        sentences = SENTENCE_SPLIT_PATTERN.split(text)
         
-        chunks = []
-        current_chunk = []
-        current_length = 0
+        # Greedy packing via prefix sums of word counts: each chunk extends
+        # to the last sentence that keeps it within chunk_size (at least one
+        # sentence), found by bisection instead of a per-sentence loop
+        word_offsets = [0, *accumulate(len(sentence.split()) for sentence in sentences)]
         
-        for sentence in sentences:
-            sent_length = len(sentence.split())
-            
-            # If adding this sentence would exceed chunk size, save current chunk
-            if current_length + sent_length > self.chunk_size and current_chunk:
-                chunks.append(" ".join(current_chunk))
-                current_chunk = []
-                current_length = 0
-            
-            current_chunk.append(sentence)
-            current_length += sent_length
-        
-        # Add remaining sentences
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
+        chunks = []
+        start = 0
+        while start < len(sentences):
+            limit = word_offsets[start] + self.chunk_size
+            end = max(bisect_right(word_offsets, limit) - 1, start + 1)
+            chunks.append(" ".join(sentences[start:end]))
+            start = end
         
         return chunks
     
@@ -249,8 +496,27 @@ class TextProcessor:
         Returns:
             List of processed chunks ready for embedding
         """
-        chunks = []
+        chunks = list(self.iter_process_document(parsed_data))
+        
+        source_file = parsed_data.get("source_file", "unknown")
+        logger.info(f"[OK] Processed {len(chunks)} chunks from {source_file}")
+        
+        return chunks
+    
+    def iter_process_document(self, parsed_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a parsed document's chunks as sections are processed.
         
+        Sections are cleaned and sent through spaCy in windows of
+        spacy_batch_size, so memory is bounded by a window rather than the
+        whole document while nlp.pipe still gets batches.
+        
+        Args:
+            parsed_data: Parsed JSON from parser
+            
+        Yields:
+            Processed chunks ready for embedding, in document order
+        """
         # Extract document type
         doc_type = parsed_data.get("document_type", "unknown")
         source_file = parsed_data.get("source_file", "unknown")
@@ -283,34 +549,27 @@ class TextProcessor:
         # Process sections (for filings and legislation)
         if "sections" in parsed_data:
             sections = parsed_data["sections"]
+            enrich = self._select_enrichment(doc_type, parsed_data)
+            prepared = self._iter_prepare_sections(sections, enrich)
             
-            for section in sections:
-                section_title = section.get("title", "Unknown")
-                section_text = section.get("text", "")
-                
-                # Clean and process text
-                cleaned_text = self.clean_html(section_text)
-                
-                # Apply contextual enrichment BEFORE normalization (preserves context structure)
-                if self.use_contextual_enrichment and self.enricher:
-                    chunk_dict = {"text": cleaned_text, "section_title": section_title}
-                    if doc_type == "html_filing":
-                        cleaned_text = self.enricher.enrich_filing_chunk(chunk_dict, parsed_data)
-                    elif doc_type == "html_legislation":
-                        cleaned_text = self.enricher.enrich_regulation_text(cleaned_text, parsed_data)
-                
-                # Normalize AFTER enrichment
-                cleaned_text = self.normalize(cleaned_text)
+            # spaCy runs per window of sections so nlp.pipe can batch them
+            window_size = self.spacy_batch_size if self.use_spacy else 1
+            while True:
+                window = list(islice(prepared, window_size))
+                if not window:
+                    break
                 
+                section_titles = [title for title, _ in window]
+                section_texts = [text for _, text in window]
                 if self.use_spacy:
-                    cleaned_text = self.clean_with_spacy(cleaned_text)
+                    section_texts = self.clean_texts_with_spacy(section_texts)
                 
-                # Chunk the text
-                section_chunks = self.chunk_text(
-                    cleaned_text,
-                    metadata={**base_metadata, "section_title": section_title}
-                )
-                chunks.extend(section_chunks)
+                for section_title, cleaned_text in zip(section_titles, section_texts):
+                    # Chunk the text
+                    yield from self.chunk_text(
+                        cleaned_text,
+                        metadata={**base_metadata, "section_title": section_title}
+                    )
         
         # Handle CSV financial data
         elif doc_type == "csv_financial" and "companies" in parsed_data:
@@ -322,13 +581,12 @@ class TextProcessor:
                 metrics = company.get("metrics", {})
                 
                 # Build text representation
-                text_parts = [f"Company: {company_name}"]
-                text_parts.append(f"Ticker: {ticker}")
-                
-                for metric_name, metric_value in metrics.items():
-                    text_parts.append(f"{metric_name}: {metric_value}")
-                
-                company_text = " ".join(text_parts)
+                company_text = f"Company: {company_name} Ticker: {ticker}"
+                if metrics:
+                    company_text += " " + " ".join(
+                        f"{metric_name}: {metric_value}"
+                        for metric_name, metric_value in metrics.items()
+                    )
                 
                 # Create a single chunk per company
                 company_metadata = {
@@ -337,14 +595,149 @@ class TextProcessor:
                     "company_name": company_name
                 }
                 
-                chunks.append({
+                yield {
                     "text": company_text,
                     "chunk_index": 0,
                     "total_chunks": 1,
                     **company_metadata
-                })
+                }
+    
+    def close(self):
+        """Shut down the HTML cleanup worker pool, if one was started."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the worker pool, starting it on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.n_process)
+        return self._executor
+    
+    def _iter_clean_html(self, sections: List[Dict[str, Any]]) -> Iterator[str]:
+        """
+        Yield each section's text with HTML removed, in order.
         
-        logger.info(f"[OK] Processed {len(chunks)} chunks from {source_file}")
+        HTML cleanup is independent per section and CPU-bound, so with
+        n_process > 1 it fans out across the processor's worker pool.
+        Sections are submitted in windows of spacy_batch_size, with at most
+        the next window in flight while the current one is consumed, so
+        memory stays bounded as in iter_process_document.
+        """
+        if self.n_process > 1 and len(sections) > 1:
+            executor = self._get_executor()
+            window_size = max(self.spacy_batch_size, self.n_process)
+            chunksize = max(1, window_size // (self.n_process * 4))
+            
+            pending = None
+            for start in range(0, len(sections), window_size):
+                raw_texts = [section.get("text", "") for section in sections[start:start + window_size]]
+                # map() submits the window now; results are read after the
+                # previous window has been yielded
+                submitted = executor.map(_html_to_text, raw_texts, chunksize=chunksize)
+                if pending is not None:
+                    yield from pending
+                pending = submitted
+            if pending is not None:
+                yield from pending
+        else:
+            for section in sections:
+                yield self.clean_html(section.get("text", ""))
+    
+    def _iter_prepare_sections(
+        self,
+        sections: List[Dict[str, Any]],
+        enrich: Optional[Callable[[str, str], str]]
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Yield (section title, text) with each section cleaned, enriched and normalized.
         
-        return chunks
-
+        Enrichment runs BEFORE normalization (preserves context structure),
+        and in the calling process even when HTML cleanup is parallel.
+        """
+        normalize = self.normalize
+        for section, cleaned_text in zip(sections, self._iter_clean_html(sections)):
+            section_title = section.get("title", "Unknown")
+            if enrich is not None:
+                cleaned_text = enrich(section_title, cleaned_text)
+            yield section_title, normalize(cleaned_text)
+    
+    def _select_enrichment(
+        self,
+        doc_type: str,
+        parsed_data: Dict[str, Any]
+    ) -> Optional[Callable[[str, str], str]]:
+        """
+        Pick the contextual enrichment step for a document once, up front.
+        
+        Returns:
+            Function of (section title, cleaned text) returning enriched text,
+            or None if this document is not enriched
+        """
+        if not (self.use_contextual_enrichment and self.enricher):
+            return None
+        
+        if doc_type == "html_filing":
+            enrich_filing_chunk = self.enricher.enrich_filing_chunk
+            return lambda title, text: enrich_filing_chunk(
+                {"text": text, "section_title": title}, parsed_data
+            )
+        if doc_type == "html_legislation":
+            enrich_regulation_text = self.enricher.enrich_regulation_text
+            return lambda title, text: enrich_regulation_text(text, parsed_data)
+        
+        return None
+    
+    def process_document_soa(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process a parsed document into column-oriented (struct-of-arrays) chunks.
+        
+        Same chunks as process_document, but as parallel columns so an
+        embedder can pass 'texts' straight to its tokenizer.
+        
+        Args:
+            parsed_data: Parsed JSON from parser
+            
+        Returns:
+            Dictionary with:
+                - texts: List of chunk texts
+                - chunk_index: array('i') of chunk indices
+                - total_chunks: array('i') of chunk counts
+                - metadata: Dict of metadata key -> list of values (None where absent)
+        """
+        chunks = self.process_document(parsed_data)
+        
+        texts = []
+        chunk_index = array('i')
+        total_chunks = array('i')
+        metadata: Dict[str, List[Any]] = {}
+        
+        for row, chunk in enumerate(chunks):
+            texts.append(chunk["text"])
+            chunk_index.append(chunk["chunk_index"])
+            total_chunks.append(chunk["total_chunks"])
+            for key, value in chunk.items():
+                if key in ("text", "chunk_index", "total_chunks"):
+                    continue
+                column = metadata.get(key)
+                if column is None:
+                    # Key first seen part-way through: backfill earlier rows
+                    column = metadata[key] = [None] * row
+                column.append(value)
+            # Keys seen earlier but missing from this chunk
+            for column in metadata.values():
+                if len(column) <= row:
+                    column.append(None)
+        
+        return {
+            "texts": texts,
+            "chunk_index": chunk_index,
+            "total_chunks": total_chunks,
+            "metadata": metadata
+        }
@@ -6,10 +6,19 @@ import json
 import logging
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Set
-from collections import defaultdict
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 logger = logging.getLogger(__name__)
 
+# Fields held as sets in memory (sorted lists on disk); each also has an
+# inverted index (value -> tickers) for search_companies
+INDEXED_FIELDS = ('regions', 'operations', 'risk_types')
+
 
 class CompanyKnowledgeDB:
     """
@@ -40,6 +49,11 @@ class CompanyKnowledgeDB:
         # In-memory database
         self.db: Dict[str, Dict[str, Any]] = {}
         
+        # Inverted indexes: field -> value -> tickers. _indexed remembers what
+        # each ticker contributed so an update can remove stale entries.
+        self._index: Dict[str, Dict[str, Set[str]]] = {}
+        self._indexed: Dict[str, Dict[str, Set[str]]] = {}
+        
         # Initialize external data provider if requested
         self.data_provider = None
         if use_external_data:
@@ -59,20 +73,80 @@ class CompanyKnowledgeDB:
         """Load database from disk."""
         if self.db_path.exists():
             try:
-                with open(self.db_path, 'r', encoding='utf-8') as f:
-                    self.db = json.load(f)
+                if HAS_ORJSON:
+                    self.db = orjson.loads(self.db_path.read_bytes())
+                else:
+                    with open(self.db_path, 'r', encoding='utf-8') as f:
+                        self.db = json.load(f)
                 logger.info(f"[OK] Loaded {len(self.db)} companies from {self.db_path}")
             except Exception as e:
                 logger.warning(f"[WARN] Failed to load database: {e}, starting fresh")
                 self.db = {}
         else:
             self.db = {}
+        
+        for company in self.db.values():
+            self._fields_to_sets(company)
+        
+        self._rebuild_index()
+    
+    @staticmethod
+    def _fields_to_sets(company: Dict[str, Any]) -> None:
+        """Convert a record's list fields to sets in place."""
+        for field in INDEXED_FIELDS:
+            if not isinstance(company.get(field), set):
+                company[field] = set(company.get(field) or [])
+    
+    def _serializable(self) -> Dict[str, Dict[str, Any]]:
+        """Copy of the database with set fields as sorted lists."""
+        return {
+            ticker: {
+                key: sorted(value) if key in INDEXED_FIELDS else value
+                for key, value in company.items()
+            }
+            for ticker, company in self.db.items()
+        }
+    
+    def _rebuild_index(self) -> None:
+        """Rebuild all inverted indexes from self.db."""
+        self._index = {field: {} for field in (*INDEXED_FIELDS, 'sector')}
+        self._indexed = {}
+        for ticker in self.db:
+            self._index_company(ticker)
+    
+    def _index_company(self, ticker: str) -> None:
+        """Refresh one company's entries in the inverted indexes."""
+        company = self.db.get(ticker) or {}
+        
+        current = {field: set(company.get(field) or []) for field in INDEXED_FIELDS}
+        sector = company.get('sector')
+        current['sector'] = {sector.lower()} if sector else set()
+        
+        previous = self._indexed.get(ticker, {})
+        for field, values in current.items():
+            old_values = previous.get(field, set())
+            field_index = self._index[field]
+            for value in old_values - values:
+                tickers = field_index.get(value)
+                if tickers:
+                    tickers.discard(ticker)
+                    if not tickers:
+                        del field_index[value]
+            for value in values - old_values:
+                field_index.setdefault(value, set()).add(ticker)
+        
+        self._indexed[ticker] = current
     
     def save(self) -> None:
         """Save database to disk."""
         try:
-            with open(self.db_path, 'w', encoding='utf-8') as f:
-                json.dump(self.db, f, indent=2, ensure_ascii=False)
+            data = self._serializable()
+            if HAS_ORJSON:
+                # Same indented UTF-8 JSON as the fallback, serialized in C
+                self.db_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.db_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
             logger.info(f"[OK] Saved {len(self.db)} companies to {self.db_path}")
         except Exception as e:
             logger.error(f"[ERROR] Failed to save database: {e}")
@@ -87,7 +161,8 @@ class CompanyKnowledgeDB:
             fetch_if_missing: If True and company not in DB, fetch from external provider
             
         Returns:
-            Company knowledge dict or None if not found
+            Company knowledge dict (regions, operations and risk_types
+            as sets) or None if not found
         """
         ticker = ticker.upper()
         
@@ -116,7 +191,9 @@ class CompanyKnowledgeDB:
             
             if enriched:
                 # Update database
+                self._fields_to_sets(enriched)
                 self.db[ticker.upper()] = enriched
+                self._index_company(ticker.upper())
                 logger.info(f"[OK] Updated {ticker} from external data provider")
                 return True
             
@@ -155,29 +232,23 @@ class CompanyKnowledgeDB:
                 'ticker': ticker,
                 'company_name': company_name,
                 'sector': sector,
-                'regions': [],
-                'operations': [],
-                'risk_types': [],
+                'regions': set(),
+                'operations': set(),
+                'risk_types': set(),
                 'metadata': metadata or {},
                 'sources': [],  # Track which filings contributed
                 'last_updated': None
             }
         
-        # Merge new data
+        # Merge new data (sets in memory; sorted on read and save)
         if regions:
-            existing_regions = set(self.db[ticker]['regions'])
-            new_regions = set(regions)
-            self.db[ticker]['regions'] = sorted(list(existing_regions | new_regions))
+            self.db[ticker]['regions'].update(regions)
         
         if operations:
-            existing_ops = set(self.db[ticker]['operations'])
-            new_ops = set(operations)
-            self.db[ticker]['operations'] = sorted(list(existing_ops | new_ops))
+            self.db[ticker]['operations'].update(operations)
         
         if risk_types:
-            existing_risks = set(self.db[ticker]['risk_types'])
-            new_risks = set(risk_types)
-            self.db[ticker]['risk_types'] = sorted(list(existing_risks | new_risks))
+            self.db[ticker]['risk_types'].update(risk_types)
         
         if sector and not self.db[ticker]['sector']:
             self.db[ticker]['sector'] = sector
@@ -187,6 +258,8 @@ class CompanyKnowledgeDB:
         
         if metadata:
             self.db[ticker]['metadata'].update(metadata)
+        
+        self._index_company(ticker)
     
     def update_from_filing(
         self,
@@ -218,17 +291,11 @@ class CompanyKnowledgeDB:
         for section in sections:
             section_text = section.get('text', '')
             
-            # Extract regions
-            regions = enricher._extract_regions_from_text(section_text)
-            all_regions.update(regions)
-            
-            # Extract operations
-            operations = enricher._identify_operations(section_text)
-            all_operations.update(operations)
-            
-            # Extract risk types
-            risks = enricher._identify_risk_types(section_text)
-            all_risks.update(risks)
+            # Extract regions, operations and risk types in one scan
+            found = enricher.scan_section(section_text)
+            all_regions.update(found['regions'])
+            all_operations.update(found['operations'])
+            all_risks.update(found['risk_types'])
         
         # Update database
         company_name = filing_data.get('company')
@@ -278,9 +345,9 @@ class CompanyKnowledgeDB:
             }
         
         return {
-            'regions': company.get('regions', []),
-            'operations': company.get('operations', []),
-            'risk_types': company.get('risk_types', []),
+            'regions': sorted(company.get('regions', ())),
+            'operations': sorted(company.get('operations', ())),
+            'risk_types': sorted(company.get('risk_types', ())),
             'sector': company.get('sector'),
             'company_name': company.get('company_name')
         }
@@ -299,9 +366,13 @@ class CompanyKnowledgeDB:
                 'avg_risk_types': 0
             }
         
-        total_regions = sum(len(c.get('regions', [])) for c in self.db.values())
-        total_operations = sum(len(c.get('operations', [])) for c in self.db.values())
-        total_risks = sum(len(c.get('risk_types', [])) for c in self.db.values())
+        # One pass for the totals; distinct values come from the inverted
+        # indexes, which hold one key per value still in use
+        total_regions = total_operations = total_risks = 0
+        for company in self.db.values():
+            total_regions += len(company.get('regions', ()))
+            total_operations += len(company.get('operations', ()))
+            total_risks += len(company.get('risk_types', ()))
         n = len(self.db)
         
         return {
@@ -309,14 +380,8 @@ class CompanyKnowledgeDB:
             'avg_regions': total_regions / n if n > 0 else 0,
             'avg_operations': total_operations / n if n > 0 else 0,
             'avg_risk_types': total_risks / n if n > 0 else 0,
-            'total_regions_mentioned': len(set(
-                region for c in self.db.values()
-                for region in c.get('regions', [])
-            )),
-            'total_operations_mentioned': len(set(
-                op for c in self.db.values()
-                for op in c.get('operations', [])
-            ))
+            'total_regions_mentioned': len(self._index['regions']),
+            'total_operations_mentioned': len(self._index['operations'])
         }
     
     def search_companies(
@@ -338,19 +403,29 @@ class CompanyKnowledgeDB:
         Returns:
             List of matching tickers
         """
-        matches = []
-        
-        for ticker, company in self.db.items():
-            if region and region not in company.get('regions', []):
-                continue
-            if operation and operation not in company.get('operations', []):
-                continue
-            if risk_type and risk_type not in company.get('risk_types', []):
-                continue
-            if sector and company.get('sector', '').lower() != sector.lower():
-                continue
-            
-            matches.append(ticker)
-        
-        return matches
+        # Intersect the inverted-index posting sets; smallest first keeps the
+        # intermediate sets small
+        filters = [
+            ('regions', region),
+            ('operations', operation),
+            ('risk_types', risk_type),
+            ('sector', sector.lower() if sector else None)
+        ]
+        postings = [
+            self._index[field].get(value, set())
+            for field, value in filters if value
+        ]
+        
+        if not postings:
+            return list(self.db)
+        
+        postings.sort(key=len)
+        matches = set(postings[0])
+        for tickers in postings[1:]:
+            matches &= tickers
+            if not matches:
+                break
+        
+        # Preserve database order, as the linear scan did
+        return [ticker for ticker in self.db if ticker in matches]
 
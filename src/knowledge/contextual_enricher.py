@@ -3,11 +3,45 @@ Contextual text enrichment for improved embeddings.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple
 import re
 
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
 logger = logging.getLogger(__name__)
 
+# Operation types and their (lowercase) trigger keywords
+OPERATION_PATTERNS = {
+    'Manufacturing': ['manufacturing', 'production', 'assembly', 'factory', 'plant'],
+    'Supply Chain': ['supply chain', 'supplier', 'vendor', 'sourcing'],
+    'Distribution': ['distribution', 'distribution channel', 'retail', 'wholesale'],
+    'Research': ['research', 'development', 'r&d', 'rd'],
+    'Sales': ['sales', 'revenue', 'market', 'customer'],
+}
+
+# Risk types and their (lowercase) trigger keywords
+RISK_PATTERNS = {
+    'Tariff/Trade': ['tariff', 'trade', 'customs', 'duty'],
+    'Supply Chain': ['supply chain', 'supplier', 'logistics'],
+    'Regulatory': ['regulation', 'compliance', 'regulatory'],
+    'Political': ['political', 'geopolitical', 'government', 'embargo'],
+    'Currency': ['currency', 'exchange rate', 'forex'],
+    'Export/Import': ['export', 'import', 'restriction'],
+}
+
+# Areas/industries a regulation may affect and their (lowercase) trigger keywords
+AREA_PATTERNS = {
+    'Technology': ['technology', 'semiconductor', 'chip', 'electronic'],
+    'Manufacturing': ['manufacturing', 'production', 'industrial'],
+    'Consumer Goods': ['consumer', 'product', 'smartphone', 'device'],
+    'Financial': ['financial', 'banking', 'payment'],
+    'Energy': ['energy', 'power', 'electric'],
+}
+
 
 class ContextualEnricher:
     """
@@ -41,6 +75,30 @@ class ContextualEnricher:
             'India': ['India', 'Indian']
         }
         
+        # Lower-cased country patterns, computed once rather than per chunk
+        self._country_patterns_lc = [
+            (region, tuple(pattern.lower() for pattern in patterns))
+            for region, patterns in self.country_patterns.items()
+        ]
+        
+        # One alternation over every region/operation/risk keyword, so callers
+        # can skip text that none of the extractors would match
+        keywords = {
+            pattern
+            for _, patterns in self._country_patterns_lc
+            for pattern in patterns
+        }
+        for pattern_map in (OPERATION_PATTERNS, RISK_PATTERNS):
+            for patterns in pattern_map.values():
+                keywords.update(patterns)
+        self._keyword_re = re.compile(
+            '|'.join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True))
+        )
+        
+        # Keyword automaton covering every category, so one pass over the
+        # text finds all of them (None: fall back to per-category scans)
+        self._automaton = self._build_automaton() if HAS_AHOCORASICK else None
+        
         self.knowledge_db = knowledge_db
         
         logger.info(f"[INFO] ContextualEnricher initialized (DB: {'enabled' if knowledge_db else 'disabled'})")
@@ -71,9 +129,10 @@ class ContextualEnricher:
             db_context = self.knowledge_db.get_enrichment_context(ticker)
         
         # Extract from current text (fallback or supplement)
-        text_regions = self._extract_regions_from_text(text)
-        text_operations = self._identify_operations(text)
-        text_risks = self._identify_risk_types(text)
+        found = self._scan(text)
+        text_regions = found['regions']
+        text_operations = found['operations']
+        text_risks = found['risk_types']
         
         # Merge DB knowledge with text-extracted (prefer DB for known companies)
         if db_context and db_context.get('regions'):
@@ -149,10 +208,9 @@ class ContextualEnricher:
         Returns:
             Enriched text with added context
         """
-        # Extract entities from regulation
-        entities = self._extract_entities_from_text(text)
-        regions = self._extract_regions_from_text(text)
-        affected_areas = self._identify_affected_areas(text)
+        found = self._scan(text)
+        regions = found['regions']
+        affected_areas = found['areas']
         
         # Build context header
         context_lines = []
@@ -186,114 +244,167 @@ class ContextualEnricher:
         
         return enriched_text
     
-    def _extract_entities_from_text(self, text: str) -> List[str]:
+    def _category_patterns(self) -> Dict[str, Dict[str, List[str]]]:
+        """Keyword tables per category, in the order labels are reported."""
+        return {
+            'regions': self.country_patterns,
+            'operations': OPERATION_PATTERNS,
+            'risk_types': RISK_PATTERNS,
+            'areas': AREA_PATTERNS
+        }
+    
+    def _build_automaton(self):
+        """
+        Build one Aho-Corasick automaton over all category keywords.
+        
+        Each lowercase keyword maps to the (category, label) pairs it
+        signals; a keyword such as 'supply chain' can tag several.
+        """
+        tags: Dict[str, Set[Tuple[str, str]]] = {}
+        for category, pattern_map in self._category_patterns().items():
+            for label, patterns in pattern_map.items():
+                for pattern in patterns:
+                    tags.setdefault(pattern.lower(), set()).add((category, label))
+        
+        automaton = ahocorasick.Automaton()
+        for keyword, keyword_tags in tags.items():
+            automaton.add_word(keyword, tuple(keyword_tags))
+        automaton.make_automaton()
+        return automaton
+    
+    def _scan(self, text: str) -> Dict[str, List[str]]:
         """
-        Extract key entities from text.
+        Find regions, operations, risk types and affected areas in one pass.
         
+        Args:
+            text: Text to scan
+            
         Returns:
-            List of entity strings
+            Dict mapping 'regions', 'operations', 'risk_types' and 'areas' to
+            matched labels, in the same order as the per-category methods
+        """
+        # Lower-case once for every category
+        text_lower = text.lower()
+        
+        if self._automaton is None:
+            return {
+                'regions': self._extract_regions_from_text(text_lower),
+                'operations': self._identify_operations(text_lower),
+                'risk_types': self._identify_risk_types(text_lower),
+                'areas': self._identify_affected_areas(text_lower)
+            }
+        
+        # Overlapping matches are all reported, so this agrees with the
+        # substring checks in the per-category methods
+        found = set()
+        for _, keyword_tags in self._automaton.iter(text_lower):
+            found.update(keyword_tags)
+        
+        return {
+            category: [label for label in pattern_map if (category, label) in found]
+            for category, pattern_map in self._category_patterns().items()
+        }
+    
+    def scan_section(self, text: str) -> Dict[str, List[str]]:
         """
-        entities = []
+        Find regions, operations and risk types in a filing section.
         
-        # Extract potential tickers (A-Z, 2-5 chars)
-        ticker_pattern = r'\b([A-Z]{2,5})\b'
-        potential_tickers = re.findall(ticker_pattern, text)
+        Without the automaton, the per-category scan is several keyword
+        loops, so has_context_keywords first rules out sections with no
+        trigger vocabulary (cover pages, exhibits, signatures). With the
+        automaton the scan is already a single pass and runs directly.
         
-        # Common company names
-        company_patterns = [
-            r'([A-Z][a-z]+\s+(Inc|Corp|LLC|Ltd|Co))',
-        ]
+        Args:
+            text: Section text
+            
+        Returns:
+            Dict mapping 'regions', 'operations' and 'risk_types' to matched
+            labels (empty lists when nothing matches)
+        """
+        if not text or (self._automaton is None and not self.has_context_keywords(text)):
+            return {'regions': [], 'operations': [], 'risk_types': []}
+        
+        found = self._scan(text)
+        return {key: found[key] for key in ('regions', 'operations', 'risk_types')}
+    
+    def has_context_keywords(self, text: str) -> bool:
+        """
+        Check whether text mentions any region, operation or risk keyword.
         
-        # Could add more sophisticated NER here
+        A False result means _scan would find no regions, operations or
+        risk types.
         
-        return entities
+        Args:
+            text: Text to check
+            
+        Returns:
+            True if at least one keyword occurs in the text
+        """
+        return self._keyword_re.search(text.lower()) is not None
     
-    def _extract_regions_from_text(self, text: str) -> List[str]:
+    def _extract_regions_from_text(self, text_lower: str) -> List[str]:
         """
         Extract mentioned countries/regions.
         
+        Args:
+            text_lower: Lower-cased text
+        
         Returns:
             List of region strings
         """
         regions = []
-        text_lower = text.lower()
-        
-        for region, patterns in self.country_patterns.items():
-            for pattern in patterns:
-                if pattern.lower() in text_lower:
-                    regions.append(region)
-                    break
+        for region, patterns in self._country_patterns_lc:
+            if any(pattern in text_lower for pattern in patterns):
+                regions.append(region)
         
         return regions
     
-    def _identify_operations(self, text: str) -> List[str]:
+    def _identify_operations(self, text_lower: str) -> List[str]:
         """
         Identify types of operations mentioned.
         
+        Args:
+            text_lower: Lower-cased text
+        
         Returns:
             List of operation types
         """
         operations = []
-        text_lower = text.lower()
-        
-        operation_patterns = {
-            'Manufacturing': ['manufacturing', 'production', 'assembly', 'factory', 'plant'],
-            'Supply Chain': ['supply chain', 'supplier', 'vendor', 'sourcing'],
-            'Distribution': ['distribution', 'distribution channel', 'retail', 'wholesale'],
-            'Research': ['research', 'development', 'r&d', 'rd'],
-            'Sales': ['sales', 'revenue', 'market', 'customer'],
-        }
-        
-        for op_type, keywords in operation_patterns.items():
+        for op_type, keywords in OPERATION_PATTERNS.items():
             if any(keyword in text_lower for keyword in keywords):
                 operations.append(op_type)
         
         return operations
     
-    def _identify_risk_types(self, text: str) -> List[str]:
+    def _identify_risk_types(self, text_lower: str) -> List[str]:
         """
         Identify types of risks mentioned.
         
+        Args:
+            text_lower: Lower-cased text
+        
         Returns:
             List of risk types
         """
         risks = []
-        text_lower = text.lower()
-        
-        risk_patterns = {
-            'Tariff/Trade': ['tariff', 'trade', 'customs', 'duty'],
-            'Supply Chain': ['supply chain', 'supplier', 'logistics'],
-            'Regulatory': ['regulation', 'compliance', 'regulatory'],
-            'Political': ['political', 'geopolitical', 'government', 'embargo'],
-            'Currency': ['currency', 'exchange rate', 'forex'],
-            'Export/Import': ['export', 'import', 'restriction'],
-        }
-        
-        for risk_type, keywords in risk_patterns.items():
+        for risk_type, keywords in RISK_PATTERNS.items():
             if any(keyword in text_lower for keyword in keywords):
                 risks.append(risk_type)
         
         return risks
     
-    def _identify_affected_areas(self, text: str) -> List[str]:
+    def _identify_affected_areas(self, text_lower: str) -> List[str]:
         """
         Identify areas/industries affected by regulation.
         
+        Args:
+            text_lower: Lower-cased text
+        
         Returns:
             List of affected areas
         """
         areas = []
-        text_lower = text.lower()
-        
-        area_patterns = {
-            'Technology': ['technology', 'semiconductor', 'chip', 'electronic'],
-            'Manufacturing': ['manufacturing', 'production', 'industrial'],
-            'Consumer Goods': ['consumer', 'product', 'smartphone', 'device'],
-            'Financial': ['financial', 'banking', 'payment'],
-            'Energy': ['energy', 'power', 'electric'],
-        }
-        
-        for area, keywords in area_patterns.items():
+        for area, keywords in AREA_PATTERNS.items():
             if any(keyword in text_lower for keyword in keywords):
                 areas.append(area)
         
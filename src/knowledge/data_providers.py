@@ -6,11 +6,20 @@ to populate the company knowledge database with rich, structured data.
 """
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 logger = logging.getLogger(__name__)
 
+# Concurrent lookups in get_company_info_batch; provider calls are network-bound
+BATCH_MAX_WORKERS = 8
+
 
 class YahooFinanceProvider:
     """
@@ -238,6 +247,18 @@ class FinancialModelingPrepProvider:
         self.base_url = 'https://financialmodelingprep.com/api/v3'
         self.available = bool(self.api_key)
         
+        # One session for all requests: keep-alive reuses TCP/TLS connections,
+        # the pool is sized for get_company_info_batch, and transient HTTP
+        # errors are retried with backoff
+        self.session = requests.Session()
+        self.session.params = {'apikey': self.api_key}
+        adapter = HTTPAdapter(
+            pool_connections=BATCH_MAX_WORKERS,
+            pool_maxsize=BATCH_MAX_WORKERS,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        
         if not self.api_key:
             logger.warning("[WARN] FMP_API_KEY not set. Financial Modeling Prep provider disabled.")
         else:
@@ -257,12 +278,9 @@ class FinancialModelingPrepProvider:
             return None
         
         try:
-            import requests
-            
             url = f"{self.base_url}/profile/{ticker.upper()}"
-            params = {'apikey': self.api_key}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -313,6 +331,11 @@ class CompanyDataProvider:
         """
         self.providers = []
         
+        # Per-ticker results of successful lookups, so repeated enrichment of
+        # the same company does not go back to the network
+        self._info_cache: Dict[str, Dict[str, Any]] = {}
+        self._cache_lock = threading.Lock()
+        
         if use_yahoo:
             yahoo = YahooFinanceProvider()
             if yahoo.available:
@@ -333,6 +356,8 @@ class CompanyDataProvider:
         Get company information from available providers.
         
         Tries providers in order and returns first successful result.
+        Successful results are cached per ticker for the provider's lifetime;
+        failures are not, so a transient error is retried on the next call.
         
         Args:
             ticker: Stock ticker symbol
@@ -340,14 +365,50 @@ class CompanyDataProvider:
         Returns:
             Dictionary with company information or None if all providers fail
         """
+        key = ticker.upper()
+        with self._cache_lock:
+            cached = self._info_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        
         for provider in self.providers:
             info = provider.get_company_info(ticker)
             if info:
-                return info
+                with self._cache_lock:
+                    self._info_cache[key] = info
+                return dict(info)
         
         logger.warning(f"[WARN] No data available for {ticker} from any provider")
         return None
     
+    def get_company_info_batch(
+        self,
+        tickers: List[str],
+        max_workers: int = BATCH_MAX_WORKERS
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get company information for many tickers concurrently.
+        
+        Lookups overlap their network round trips in a thread pool and fill
+        the per-ticker cache, so later get_company_info calls are local.
+        
+        Args:
+            tickers: Stock ticker symbols
+            max_workers: Number of concurrent lookups
+            
+        Returns:
+            Dict mapping each upper-cased ticker to its info (None if unavailable)
+        """
+        unique = list(dict.fromkeys(t.upper() for t in tickers))
+        if not unique:
+            return {}
+        
+        if max_workers <= 1 or len(unique) == 1:
+            return {ticker: self.get_company_info(ticker) for ticker in unique}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as executor:
+            return dict(zip(unique, executor.map(self.get_company_info, unique)))
+    
     def enrich_company_knowledge(
         self,
         ticker: str,
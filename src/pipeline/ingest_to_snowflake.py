@@ -282,8 +282,10 @@ def main():
         format='[%(levelname)s] %(message)s'
     )
     
-    # Initialize pipeline
-    pipeline = SnowflakeIngestionPipeline()
+    # Initialize pipeline (batch loads may run against a fresh account)
+    pipeline = SnowflakeIngestionPipeline(
+        snowflake_client=SnowflakeClient(ensure_schema=True)
+    )
     
     input_dir = Path(args.input_dir)
     
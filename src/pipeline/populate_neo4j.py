@@ -5,6 +5,7 @@ Reads filings from Snowflake, extracts entities using Gemini, and populates Neo4
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import sys
@@ -110,96 +111,88 @@ class Neo4jPopulationPipeline:
                 company_name=company_name
             )
             
-            # Step 4: Create company node
-            self.neo4j_client.create_company_node(
-                ticker=ticker,
-                company_name=company_name,
-                sector=sector,
-                industry=industry
-            )
-            
-            # Step 5: Create sector node and link if provided
-            if sector:
-                self.neo4j_client.create_sector_node(sector)
-                self.neo4j_client.create_relationships(
+            # Steps 4-8 share one Neo4j session
+            with self.neo4j_client.bulk():
+                # Step 4: Create company node
+                self.neo4j_client.create_company_node(
                     ticker=ticker,
-                    relationships=[{
-                        'type': 'OPERATES_IN',
-                        'target': sector,
-                        'target_label': 'Sector',
-                        'properties': {}
-                    }]
+                    company_name=company_name,
+                    sector=sector,
+                    industry=industry
                 )
             
-            # Step 6: Create supplier nodes and relationships
-            suppliers = entities.get('suppliers', [])
-            supplier_relationships = []
-            for supplier in suppliers[:20]:  # Limit to top 20 suppliers
-                self.neo4j_client.create_supplier_node(supplier)
-                supplier_relationships.append({
-                    'type': 'SUPPLIES_TO',
-                    'target': supplier,
-                    'target_label': 'Supplier',
-                    'properties': {}
-                })
+                # Step 5: Create sector node and link if provided
+                if sector:
+                    self.neo4j_client.create_sector_node(sector)
+                    self.neo4j_client.create_relationships(
+                        ticker=ticker,
+                        relationships=[{
+                            'type': 'OPERATES_IN',
+                            'target': sector,
+                            'target_label': 'Sector',
+                            'properties': {}
+                        }]
+                    )
             
-            if supplier_relationships:
-                self.neo4j_client.create_relationships(
-                    ticker=ticker,
-                    relationships=supplier_relationships
-                )
+                # Step 6: Create supplier nodes and relationships
+                suppliers = entities.get('suppliers', [])
+                if suppliers:
+                    self.neo4j_client.bulk_upsert_suppliers(
+                        ticker=ticker,
+                        suppliers=[{'name': s} for s in suppliers[:20]]  # Limit to top 20 suppliers
+                    )
             
-            # Step 7: Create country/region nodes and relationships
-            countries = entities.get('countries', [])
-            country_relationships = []
-            for country in countries[:20]:  # Limit to top 20 countries
-                # Create Country node (reuse Sector node structure for simplicity)
-                self.neo4j_client.create_sector_node(country)  # Using Sector as generic location node
-                country_relationships.append({
-                    'type': 'OPERATES_IN',
-                    'target': country,
-                    'target_label': 'Sector',  # Using Sector as generic location
-                    'properties': {}
-                })
+                # Step 7: Create country/region nodes and relationships
+                countries = entities.get('countries', [])
+                country_relationships = []
+                for country in countries[:20]:  # Limit to top 20 countries
+                    # Create Country node (reuse Sector node structure for simplicity)
+                    self.neo4j_client.create_sector_node(country)  # Using Sector as generic location node
+                    country_relationships.append({
+                        'type': 'OPERATES_IN',
+                        'target': country,
+                        'target_label': 'Sector',  # Using Sector as generic location
+                        'properties': {}
+                    })
             
-            if country_relationships:
-                self.neo4j_client.create_relationships(
-                    ticker=ticker,
-                    relationships=country_relationships
-                )
+                if country_relationships:
+                    self.neo4j_client.create_relationships(
+                        ticker=ticker,
+                        relationships=country_relationships
+                    )
             
-            # Step 8: Create relationships from extracted relationships
-            extracted_rels = entities.get('relationships', [])
-            if extracted_rels:
-                formatted_rels = []
-                for rel in extracted_rels[:20]:  # Limit relationships
-                    rel_type = rel.get('type', '').upper()
-                    target = rel.get('target', '')
+                # Step 8: Create relationships from extracted relationships
+                extracted_rels = entities.get('relationships', [])
+                if extracted_rels:
+                    formatted_rels = []
+                    for rel in extracted_rels[:20]:  # Limit relationships
+                        rel_type = rel.get('type', '').upper()
+                        target = rel.get('target', '')
                     
-                    # Determine target label based on relationship type
-                    if 'SUPPLIER' in rel_type:
-                        target_label = 'Supplier'
-                        self.neo4j_client.create_supplier_node(target)
-                    elif 'COUNTRY' in rel_type or 'OPERATES' in rel_type:
-                        target_label = 'Sector'  # Using Sector as generic location
-                        self.neo4j_client.create_sector_node(target)
-                    else:
-                        continue
+                        # Determine target label based on relationship type
+                        if 'SUPPLIER' in rel_type:
+                            target_label = 'Supplier'
+                            self.neo4j_client.create_supplier_node(target)
+                        elif 'COUNTRY' in rel_type or 'OPERATES' in rel_type:
+                            target_label = 'Sector'  # Using Sector as generic location
+                            self.neo4j_client.create_sector_node(target)
+                        else:
+                            continue
                     
-                    formatted_rels.append({
-                        'type': rel_type,
-                        'target': target,
-                        'target_label': target_label,
-                        'properties': {
-                            'evidence': rel.get('evidence', '')
-                        }
-                    })
+                        formatted_rels.append({
+                            'type': rel_type,
+                            'target': target,
+                            'target_label': target_label,
+                            'properties': {
+                                'evidence': rel.get('evidence', '')
+                            }
+                        })
                 
-                if formatted_rels:
-                    self.neo4j_client.create_relationships(
-                        ticker=ticker,
-                        relationships=formatted_rels
-                    )
+                    if formatted_rels:
+                        self.neo4j_client.create_relationships(
+                            ticker=ticker,
+                            relationships=formatted_rels
+                        )
             
             logger.info(f"[OK] Populated Neo4j for {ticker}: {len(suppliers)} suppliers, {len(countries)} countries")
             
@@ -221,24 +214,45 @@ class Neo4jPopulationPipeline:
     
     def populate_all_companies(
         self,
-        tickers: List[str]
+        tickers: List[str],
+        max_workers: int = 4
     ) -> Dict[str, Any]:
         """
         Populate Neo4j for multiple companies.
         
+        Companies are independent, so they are processed on a thread pool to
+        overlap the Snowflake, Gemini and Neo4j round-trips of different
+        tickers. Each worker thread uses its own Neo4j session.
+        
         Args:
             tickers: List of company tickers
+            max_workers: Number of companies processed concurrently
+                (1 = sequential; keep below the Neo4j connection pool size)
         
         Returns:
             Dictionary with results for each company
         """
-        logger.info(f"[INFO] Populating Neo4j for {len(tickers)} companies")
+        logger.info(f"[INFO] Populating Neo4j for {len(tickers)} companies ({max_workers} workers)")
         
         results = {}
         
-        for ticker in tickers:
-            result = self.populate_company(ticker)
-            results[ticker] = result
+        if max_workers <= 1:
+            for ticker in tickers:
+                results[ticker] = self.populate_company(ticker)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(self.populate_company, ticker): ticker for ticker in tickers}
+                
+                for future in as_completed(futures):
+                    ticker = futures[future]
+                    try:
+                        results[ticker] = future.result()
+                    except Exception as e:
+                        logger.error(f"[ERROR] Worker failed for {ticker}: {e}")
+                        results[ticker] = {'success': False, 'error': str(e)}
+            
+            # Keep results in input order
+            results = {ticker: results[ticker] for ticker in tickers}
         
         successful = len([r for r in results.values() if r.get('success')])
         logger.info(f"[OK] Populated Neo4j for {successful}/{len(tickers)} companies")
@@ -267,6 +281,13 @@ def main():
         help='Process single ticker (alternative to --tickers)'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Number of companies to process concurrently (default: 4)'
+    )
+    
     args = parser.parse_args()
     
     # Configure logging
@@ -287,7 +308,7 @@ def main():
     pipeline = Neo4jPopulationPipeline()
     
     # Populate
-    results = pipeline.populate_all_companies(tickers)
+    results = pipeline.populate_all_companies(tickers, max_workers=args.workers)
     
     # Print summary
     print(f"\nNeo4j Population Summary:")
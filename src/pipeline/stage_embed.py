@@ -93,19 +93,10 @@ class EmbeddingStage:
             return context
         
         try:
-            # Download JSON from S3
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp_file:
-                tmp_path = Path(tmp_file.name)
-            
-            success = self.s3_client.download_file(input_key, tmp_path)
-            if not success:
-                raise Exception(f"Failed to download {input_key} from S3")
-            
-            # Load JSON
-            import json
-            with open(tmp_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Read JSON straight from S3 (no temp file round-trip)
+            data = self.s3_client.read_json(input_key)
+            if not data:
+                raise Exception(f"Failed to read {input_key} from S3")
             
             # Check if this is aggregated data (has aggregated_sections and knowledge_graph)
             is_aggregated = 'aggregated_sections' in data or 'knowledge_graph' in data
@@ -148,10 +139,6 @@ class EmbeddingStage:
                 'embedding_dim': result['embedding_dim']
             })
             
-            # Cleanup
-            if tmp_path.exists():
-                tmp_path.unlink()
-            
             return context
             
         except Exception as e:
@@ -510,7 +510,14 @@ class RegulatoryRiskScorer:
         chunk_data: List[Dict[str, Any]],
         top_n: int = 10
     ) -> List[Dict[str, Any]]:
-        """Get top N contributing chunks sorted by exposure."""
+        """
+        Get top N contributing chunks sorted by exposure.
+        
+        Each entry carries the API key set (section_type, section_title,
+        filing_type, filing_date, sentence_text, similarity, weight, exposure)
+        with defaults applied, plus the weight components w_section,
+        w_recency and w_size, which API callers project away.
+        """
         sorted_chunks = sorted(chunk_data, key=lambda x: x['exposure'], reverse=True)
         
         contributors = []
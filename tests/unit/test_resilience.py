@@ -0,0 +1,124 @@
+"""
+Unit tests for database retry and circuit-breaker helpers.
+"""
+
+import threading
+
+import pytest
+
+from src.db.resilience import CircuitBreaker, CircuitOpenError, with_retry
+
+
+class TransientError(Exception):
+    """Stand-in for a driver's transient error."""
+
+
+class QueryError(Exception):
+    """Stand-in for a non-transient error (bad SQL, constraint violation)."""
+
+
+def _raise(exc):
+    def func():
+        raise exc
+    return func
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker."""
+    
+    @pytest.fixture
+    def breaker(self):
+        """Breaker that trips on TransientError after two failures."""
+        return CircuitBreaker('test', fail_max=2, reset_timeout=60.0, failure_types=(TransientError,))
+    
+    def test_opens_after_consecutive_transient_failures(self, breaker):
+        """Test that fail_max transient failures open the circuit."""
+        for _ in range(2):
+            with pytest.raises(TransientError):
+                breaker.call(_raise(TransientError()))
+        
+        assert breaker.is_open
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: 'ok')
+    
+    def test_non_transient_errors_do_not_trip(self, breaker):
+        """Test that errors outside failure_types pass through uncounted."""
+        for _ in range(5):
+            with pytest.raises(QueryError):
+                breaker.call(_raise(QueryError()))
+        
+        assert not breaker.is_open
+        assert breaker.call(lambda: 'ok') == 'ok'
+    
+    def test_half_open_allows_single_trial(self, breaker, monkeypatch):
+        """Test that only one trial call runs while half-open."""
+        for _ in range(2):
+            with pytest.raises(TransientError):
+                breaker.call(_raise(TransientError()))
+        # Pretend reset_timeout has elapsed
+        breaker._opened_at -= 120.0
+        
+        trial_started = threading.Event()
+        release_trial = threading.Event()
+        
+        def slow_trial():
+            trial_started.set()
+            release_trial.wait(5)
+            return 'ok'
+        
+        results = []
+        trial = threading.Thread(target=lambda: results.append(breaker.call(slow_trial)))
+        trial.start()
+        assert trial_started.wait(5)
+        
+        # A concurrent caller fails fast while the trial is in flight
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: 'ok')
+        
+        release_trial.set()
+        trial.join(5)
+        
+        assert results == ['ok']
+        assert not breaker.is_open
+    
+    def test_failed_trial_reopens(self, breaker):
+        """Test that a transient failure during the trial re-opens the circuit."""
+        for _ in range(2):
+            with pytest.raises(TransientError):
+                breaker.call(_raise(TransientError()))
+        breaker._opened_at -= 120.0
+        
+        with pytest.raises(TransientError):
+            breaker.call(_raise(TransientError()))
+        
+        assert breaker.is_open
+
+
+class TestWithRetry:
+    """Test suite for with_retry."""
+    
+    def test_retries_transient_then_succeeds(self, monkeypatch):
+        """Test that transient errors are retried until success."""
+        monkeypatch.setattr('src.db.resilience.time.sleep', lambda _: None)
+        attempts = []
+        
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise TransientError()
+            return 'ok'
+        
+        assert with_retry(flaky, (TransientError,)) == 'ok'
+        assert len(attempts) == 3
+    
+    def test_does_not_retry_other_errors(self):
+        """Test that non-transient errors are raised immediately."""
+        attempts = []
+        
+        def bad_query():
+            attempts.append(1)
+            raise QueryError()
+        
+        with pytest.raises(QueryError):
+            with_retry(bad_query, (TransientError,))
+        assert len(attempts) == 1
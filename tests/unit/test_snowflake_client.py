@@ -0,0 +1,171 @@
+"""
+Unit tests for SnowflakeClient (mocked connection, no Snowflake account needed).
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("snowflake.connector")
+
+from src.db import snowflake_client
+from src.db.snowflake_client import SnowflakeClient
+
+
+EMBEDDING = [0.25] * 768
+
+ROW = {
+    'ID': 'doc-1',
+    'TICKER': 'AAPL',
+    'COMPANY_NAME': 'Apple Inc.',
+    'FILING_TYPE': '10-K',
+    'FILING_DATE': None,
+    'SECTION_TYPE': 'risk_factors',
+    'SECTION_TITLE': 'Risk Factors',
+    'CHUNK_TEXT': 'Tariffs on imports from China.',
+    'ORIGINAL_SENTENCE': 'Tariffs on imports from China.',
+    'SIMILARITY': 0.91
+}
+
+
+@pytest.fixture
+def cursor():
+    """Cursor shared by every conn.cursor() context."""
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (EMBEDDING,)
+    cursor.fetchall.return_value = []
+    return cursor
+
+
+@pytest.fixture
+def client(monkeypatch, cursor):
+    """SnowflakeClient wired to a mocked connection."""
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    monkeypatch.setattr(snowflake_client.snowflake.connector, 'connect', lambda **kwargs: conn)
+    return SnowflakeClient(account='acct', user='user', password='pw')
+
+
+def _cortex_calls(cursor):
+    return [c for c in cursor.execute.call_args_list if 'EMBED_TEXT_768' in c.args[0]]
+
+
+def _search_calls(cursor):
+    return [c for c in cursor.execute.call_args_list if 'VECTOR_COSINE_SIMILARITY' in c.args[0]]
+
+
+class TestSimilaritySearch:
+    """Test suite for similarity_search query-embedding caching."""
+    
+    def test_miss_embeds_once_and_caches_without_hits(self, client, cursor):
+        """Test that a miss calls Cortex once and caches even with no results."""
+        assert client.similarity_search("tariff exposure") == []
+        assert client.similarity_search("tariff exposure") == []
+        
+        assert len(_cortex_calls(cursor)) == 1
+        searches = _search_calls(cursor)
+        assert len(searches) == 2
+        for call in searches:
+            sql, params = call.args
+            assert "PARSE_JSON(?)::VECTOR(FLOAT, 768)" in sql
+            assert "EMBED_TEXT_768" not in sql
+            assert "q.query_embedding AS query_embedding" not in sql
+            assert json.loads(params[0]) == EMBEDDING
+    
+    def test_hit_binds_cached_embedding(self, client, cursor):
+        """Test that a cached query skips Cortex and formats rows."""
+        client._cache_query_embedding(client._query_embedding_key("supply chain"), EMBEDDING)
+        cursor.fetchall.return_value = [ROW]
+        
+        results = client.similarity_search("supply chain", ticker="AAPL", top_k=5, min_similarity=0.5)
+        
+        assert _cortex_calls(cursor) == []
+        sql, params = _search_calls(cursor)[0].args
+        assert json.loads(params[0]) == EMBEDDING
+        assert params[1:] == ["AAPL", 0.5]
+        assert "LIMIT 5" in sql
+        assert results == [{
+            'doc_id': 'doc-1',
+            'ticker': 'AAPL',
+            'company_name': 'Apple Inc.',
+            'filing_type': '10-K',
+            'filing_date': None,
+            'section_type': 'risk_factors',
+            'section_title': 'Risk Factors',
+            'chunk_text': 'Tariffs on imports from China.',
+            'original_sentence': 'Tariffs on imports from China.',
+            'similarity': 0.91
+        }]
+
+
+class TestGetCompanyChunks:
+    """Test suite for get_company_chunks embedding retrieval."""
+    
+    def test_include_embedding_returns_float32_rows(self, client, cursor):
+        """Test that embeddings come back as float32 rows via Arrow batches."""
+        pa = pytest.importorskip("pyarrow")
+        np = pytest.importorskip("numpy")
+        
+        rows = [
+            dict(ROW, ID='doc-1', SENTENCE_IDX=0, TOTAL_SENTENCES=2),
+            dict(ROW, ID='doc-2', SENTENCE_IDX=1, TOTAL_SENTENCES=2),
+            dict(ROW, ID='doc-3', SENTENCE_IDX=2, TOTAL_SENTENCES=3)
+        ]
+        embeddings = [[0.5] * 768, None, [0.25] * 768]
+        table = pa.table({
+            **{key: [row[key] for row in rows] for key in rows[0] if key != 'SIMILARITY'},
+            'EMBEDDING': pa.array(embeddings, type=pa.list_(pa.float32(), 768))
+        })
+        cursor.fetch_arrow_batches.return_value = iter([table])
+        
+        chunks = client.get_company_chunks("AAPL", include_embedding=True)
+        
+        assert [c['doc_id'] for c in chunks] == ['doc-1', 'doc-2', 'doc-3']
+        assert chunks[0]['embedding'].dtype == np.float32
+        assert chunks[0]['embedding'].shape == (768,)
+        np.testing.assert_array_equal(chunks[0]['embedding'], np.full(768, 0.5, dtype=np.float32))
+        assert 'embedding' not in chunks[1]
+        np.testing.assert_array_equal(chunks[2]['embedding'], np.full(768, 0.25, dtype=np.float32))
+        assert chunks[2]['text'] == ROW['CHUNK_TEXT']
+        cursor.fetchmany.assert_not_called()
+
+
+class TestStoreFilingChunks:
+    """Test suite for store_filing_chunks staging ids."""
+    
+    def test_ids_unique_across_filings_and_sections(self, client, cursor, monkeypatch):
+        """Test that same-bucket sections of two filings get distinct, stable ids."""
+        pytest.importorskip("pandas")
+        staged = []
+        
+        def fake_write_pandas(conn, df, table_name, **kwargs):
+            staged.append(df)
+            return True, 1, len(df), None
+        
+        monkeypatch.setattr(snowflake_client, 'write_pandas', fake_write_pandas)
+        chunks = [
+            {
+                'text': f"{title} text from {date}",
+                'section_type': 'other',
+                'section_title': title,
+                'filing_type': '10-K',
+                'filing_date': date,
+                'sentence_idx': 0,
+                'total_sentences': 1
+            }
+            for date in ('2023-11-03', '2024-11-01')
+            for title in ('Item 2. Properties', 'Item 3. Legal Proceedings')
+        ]
+        
+        client.store_filing_chunks("AAPL", "Apple Inc.", chunks)
+        client.store_filing_chunks("AAPL", "Apple Inc.", chunks)
+        
+        first, second = staged
+        assert len(first) == len(chunks)
+        assert first['id'].is_unique
+        assert list(first['id']) == list(second['id'])
+        merge_sql = next(
+            c.args[0] for c in cursor.execute.call_args_list if 'MERGE INTO' in c.args[0]
+        )
+        assert "ON t.id = s.id" in merge_sql
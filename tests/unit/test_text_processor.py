@@ -47,6 +47,17 @@ class TestTextProcessor:
         assert "chunk_index" in chunks[0]
         assert "total_chunks" in chunks[0]
     
+    def test_chunk_text_short_text_single_chunk(self, processor):
+        """Test that text within chunk_size comes back as one chunk."""
+        text = "Short text that fits in one chunk."
+        chunks = processor.chunk_text(text, metadata={"test": True})
+        
+        assert len(chunks) == 1
+        assert chunks[0]["text"] == text
+        assert chunks[0]["chunk_index"] == 0
+        assert chunks[0]["total_chunks"] == 1
+        assert chunks[0]["test"] is True
+    
     def test_process_filing_document(self, processor):
         """Test processing filing document."""
         data = {
@@ -130,3 +141,44 @@ class TestTextProcessor:
         assert chunks[1]["ticker"] == "MSFT"
         assert all("Apple Inc." in c["text"] or "Microsoft Corp." in c["text"] for c in chunks)
 
+    
+    def test_spacy_cleaning_is_cached(self, processor, monkeypatch):
+        """Test repeated texts are sent through spaCy only once."""
+        seen = []
+        
+        class FakeNLP:
+            def __call__(self, text):
+                seen.append(text)
+                return text
+            
+            def pipe(self, texts, batch_size, n_process=1):
+                for text in texts:
+                    yield self(text)
+        
+        processor.use_spacy = True
+        processor.nlp = FakeNLP()
+        monkeypatch.setattr(TextProcessor, "_lemmatize_doc", staticmethod(lambda doc: doc.lower()))
+        
+        result = processor.clean_texts_with_spacy(["Risk", "Supply", "Risk"])
+        assert result == ["risk", "supply", "risk"]
+        assert processor.clean_with_spacy("Supply") == "supply"
+        assert seen == ["Risk", "Supply"]
+    
+    def test_process_document_soa(self, processor):
+        """Test column-oriented document processing."""
+        data = {
+            "document_type": "csv_financial",
+            "source_file": "composition.csv",
+            "companies": [
+                {"ticker": "AAPL", "company": "Apple Inc.", "metrics": {"weight": 0.0597}},
+                {"ticker": "MSFT", "company": "Microsoft Corp.", "metrics": {}}
+            ]
+        }
+        
+        result = processor.process_document_soa(data)
+        
+        assert len(result["texts"]) == 2
+        assert "Apple Inc." in result["texts"][0]
+        assert list(result["chunk_index"]) == [0, 0]
+        assert list(result["total_chunks"]) == [1, 1]
+        assert result["metadata"]["ticker"] == ["AAPL", "MSFT"]